@@ -9,12 +9,16 @@ from sqlalchemy import pool
 from alembic import context
 
 from db.base import Base
-from db.models import channel, project, summary
+from db.models import cache, channel, project, resource_version, search, summary, transcript_blob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# The DATABASE_URL the services use takes precedence over alembic.ini
+if os.getenv("DATABASE_URL"):
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -0,0 +1,38 @@
+"""make partial segments jsonb
+
+Revision ID: 7d4f1e9c3b58
+Revises: 2c8e5a7b0f43
+Create Date: 2026-10-18 09:12:44.381905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4f1e9c3b58'
+down_revision: Union[str, None] = '2c8e5a7b0f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # jsonb supports ||, so each flush appends its segments instead of rewriting them all
+    op.alter_column('summaries', 'partial_segments',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(),
+               existing_nullable=True,
+               postgresql_using='partial_segments::jsonb')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('summaries', 'partial_segments',
+               existing_type=postgresql.JSONB(),
+               type_=sa.JSON(),
+               existing_nullable=True,
+               postgresql_using='partial_segments::json')
@@ -0,0 +1,110 @@
+"""move transcript cache to blob store
+
+Revision ID: f41b6c8d2e97
+Revises: 9c2e7a4f1d38
+Create Date: 2026-10-17 23:41:26.904317
+
+"""
+import hashlib
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41b6c8d2e97'
+down_revision: Union[str, None] = '9c2e7a4f1d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transcript_cache', sa.Column('transcript_ref', sa.String(), nullable=True))
+
+    # Same payload as services.transcript_store, so entries share blobs with their summaries
+    conn = op.get_bind()
+    blobs = sa.table(
+        'transcript_blobs',
+        sa.column('hash', sa.String()),
+        sa.column('codec', sa.String()),
+        sa.column('size', sa.Integer()),
+        sa.column('data', sa.LargeBinary()),
+    )
+    stored = {
+        row[0] for row in conn.execute(sa.text("SELECT hash FROM transcript_blobs"))
+    }
+    rows = conn.execute(
+        sa.text("SELECT cache_key, transcript, segments FROM transcript_cache")
+    ).fetchall()
+    for cache_key, transcript, segments in rows:
+        if isinstance(segments, str):
+            segments = json.loads(segments)
+        payload = json.dumps(
+            {
+                "text": transcript,
+                "segments": [
+                    {key: segment[key] for key in ("id", "start", "end", "text") if key in segment}
+                    for segment in segments or []
+                ],
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        ref = hashlib.sha256(payload).hexdigest()
+        if ref not in stored:
+            conn.execute(
+                blobs.insert().values(
+                    hash=ref, codec="zlib", size=len(payload), data=zlib.compress(payload, 9)
+                )
+            )
+            stored.add(ref)
+        conn.execute(
+            sa.text("UPDATE transcript_cache SET transcript_ref = :ref WHERE cache_key = :key"),
+            {"ref": ref, "key": cache_key},
+        )
+
+    op.alter_column('transcript_cache', 'transcript_ref', nullable=False)
+    op.create_foreign_key('fk_transcript_cache_transcript_ref', 'transcript_cache', 'transcript_blobs', ['transcript_ref'], ['hash'])
+    op.drop_column('transcript_cache', 'segments')
+    op.drop_column('transcript_cache', 'transcript')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('transcript_cache', sa.Column('transcript', sa.VARCHAR(), autoincrement=False, nullable=True))
+    op.add_column('transcript_cache', sa.Column('segments', sa.JSON(), autoincrement=False, nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT c.cache_key, b.codec, b.data FROM transcript_cache c "
+            "JOIN transcript_blobs b ON b.hash = c.transcript_ref"
+        )
+    ).fetchall()
+    for cache_key, codec, data in rows:
+        if codec == "zstd":
+            import zstandard
+
+            payload = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            payload = zlib.decompress(data)
+        transcript = json.loads(payload)
+        conn.execute(
+            sa.text(
+                "UPDATE transcript_cache SET transcript = :transcript, segments = :segments "
+                "WHERE cache_key = :key"
+            ),
+            {
+                "transcript": transcript["text"],
+                "segments": json.dumps(transcript["segments"]),
+                "key": cache_key,
+            },
+        )
+
+    op.alter_column('transcript_cache', 'transcript', nullable=False)
+    op.drop_constraint('fk_transcript_cache_transcript_ref', 'transcript_cache', type_='foreignkey')
+    op.drop_column('transcript_cache', 'transcript_ref')
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from db.session import AsyncSessionLocal
+from services.resource_versions import read_versions
+
+# Headers recomputed for every response instead of being replayed from the cache
+UNCACHED_HEADERS = {"content-length", "date", "server"}
+
+
+def versioned(*keys):
+    """
+    Declare the version keys a GET endpoint's response depends on. Keys are
+    formatted with the path parameters, e.g. "channel:{channel_id}". Takes
+    effect on routers using CachedRoute.
+
+    Args:
+        *keys (str): Version key templates, see services.resource_versions
+    """
+
+    def decorate(endpoint):
+        endpoint.version_keys = keys
+        return endpoint
+
+    return decorate
+
+
+class ResponseCache:
+    """
+    In-process LRU of serialized response bodies, keyed by ETag. An ETag
+    covers the versions of everything the body depends on, so a write never
+    has to find the entries it invalidates: they are simply never asked for
+    again and age out.
+    """
+
+    def __init__(self, max_entries=None, max_entry_bytes=None):
+        """
+        Args:
+            max_entries (int, optional): Bodies kept, 0 disables the cache.
+                Defaults to RESPONSE_CACHE_SIZE.
+            max_entry_bytes (int, optional): Larger bodies are not cached.
+                Defaults to RESPONSE_CACHE_MAX_BYTES.
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+        if max_entry_bytes is None:
+            max_entry_bytes = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(1024 * 1024)))
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag, body, headers):
+        if self.max_entries <= 0 or len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._entries[etag] = (body, headers)
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(request, versions):
+    """
+    Strong ETag of a GET request: the same URL at the same versions always
+    produces the same body.
+
+    Args:
+        request (Request): Incoming request
+        versions (dict): Version per key the response depends on
+
+    Returns:
+        str: Quoted ETag
+    """
+    digest = hashlib.sha256()
+    digest.update(request.url.path.encode())
+    digest.update(b"?" + request.url.query.encode())
+    for key in sorted(versions):
+        digest.update(f"\n{key}={versions[key]}".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Returns:
+        bool: Whether an If-None-Match header matches the ETag (weak comparison)
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def _load_versions(keys):
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(read_versions, keys)
+
+
+class CachedRoute(APIRoute):
+    """
+    Route serving conditional GETs for endpoints decorated with versioned.
+    A request costs one version lookup; then, in order:
+    * If-None-Match still matches: 304 Not Modified, nothing is queried
+    * the body for this ETag is in the response cache: it is replayed
+    * otherwise the endpoint runs and its 200 response is tagged and cached
+
+    Versions are read before the endpoint queries, so a write racing the request
+    can only make the body newer than its ETag, never older.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        keys = getattr(self.endpoint, "version_keys", None)
+        if not keys or "GET" not in self.methods:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            versions = await _load_versions(
+                [key.format(**request.path_params) for key in keys]
+            )
+            etag = make_etag(request, versions)
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+
+            cached = response_cache.get(etag)
+            if cached is not None:
+                body, cached_headers = cached
+                return Response(content=body, headers=cached_headers)
+
+            response = await handler(request)
+            if response.status_code == 200:
+                response.headers.update(headers)
+                response_cache.put(
+                    etag,
+                    response.body,
+                    {
+                        name: value
+                        for name, value in response.headers.items()
+                        if name not in UNCACHED_HEADERS
+                    },
+                )
+            return response
+
+        return cached_handler
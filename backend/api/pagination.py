@@ -0,0 +1,76 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at, row_id):
+    """
+    Encode the position of a row in a (created_at, id) ordering.
+
+    Args:
+        created_at (datetime): created_at of the last row of a page
+        row_id (int): id of the last row of a page
+
+    Returns:
+        str: Opaque, URL-safe cursor
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor returned by encode_cursor.
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, model, response: Response, cursor=None, limit=100, descending=False):
+    """
+    Keyset pagination on (created_at, id). Each page is an index range scan that
+    starts right after the previous page, so its cost does not grow with the
+    table the way OFFSET does. The cursor of the next page, if any, is returned
+    in the X-Next-Cursor header.
+
+    Args:
+        query: Query selecting the rows to list
+        model: Mapped class with created_at and id columns
+        response (Response): Response receiving the X-Next-Cursor header
+        cursor (str, optional): X-Next-Cursor of the previous page
+        limit (int): Page size, capped at MAX_PAGE_SIZE
+        descending (bool): Newest first instead of oldest first
+
+    Returns:
+        list: The rows of the page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    key = tuple_(model.created_at, model.id)
+    if cursor:
+        position = tuple_(*decode_cursor(cursor))
+        query = query.filter(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at, model.id)
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
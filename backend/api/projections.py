@@ -0,0 +1,267 @@
+import os
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import undefer
+
+from db.models.channel import Channel
+from db.models.summary import Summary
+from db.schemas.channel import ChannelItem
+from db.schemas.project import ProjectItem
+from db.schemas.summary import SummaryItem
+from api.pagination import encode_cursor
+from services.transcript_store import load_transcript_texts
+
+SUMMARY_METADATA = (
+    "id",
+    "job_id",
+    "channel_id",
+    "original_filename",
+    "created_at",
+    "status",
+    "slack_notification_sent",
+    "slack_error",
+)
+SUMMARY_TEXT_FIELDS = ("summary", "transcript")
+
+
+def get_embedded_summary_limit():
+    """
+    Returns:
+        int: Summaries embedded per channel in expanded channels, EMBEDDED_SUMMARIES
+    """
+    return max(1, int(os.getenv("EMBEDDED_SUMMARIES", "20")))
+
+
+def parse_options(value, allowed, name):
+    """
+    Parse a comma separated query option such as fields or expand.
+
+    Args:
+        value (str): Raw query value, may be None or empty
+        allowed (iterable): Accepted names
+        name (str): Query parameter name, for the error message
+
+    Returns:
+        set: The requested names
+
+    Raises:
+        HTTPException: 400 if a name is not allowed
+    """
+    if not value:
+        return set()
+    requested = {part.strip() for part in value.split(",") if part.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(sorted(allowed))}",
+        )
+    return requested
+
+
+def parse_summary_fields(fields):
+    return parse_options(fields, SUMMARY_TEXT_FIELDS, "fields")
+
+
+def summary_load_options(fields):
+    """
+    Returns:
+        list: Query options loading the requested text columns with the rows
+    """
+    return [undefer(Summary.summary)] if "summary" in fields else []
+
+
+def summary_item(summary, fields=(), transcripts=None):
+    """
+    Serialize a summary without touching the text that was not requested, so
+    deferred columns are never lazy-loaded row by row.
+
+    Args:
+        summary (Summary): Row loaded with summary_load_options(fields)
+        fields (iterable): Text fields to include
+        transcripts (dict, optional): Transcript text by reference, from
+            load_transcript_texts, required if "transcript" is in fields
+    """
+    data = {name: getattr(summary, name) for name in SUMMARY_METADATA}
+    if "summary" in fields:
+        data["summary"] = summary.summary
+    if "transcript" in fields:
+        data["transcript"] = transcripts.get(summary.transcript_ref)
+    return SummaryItem(**data)
+
+
+def summary_items(db, summaries, fields=()):
+    """
+    Serialize a page of summaries, fetching the requested transcripts in one query.
+    """
+    transcripts = None
+    if "transcript" in fields:
+        transcripts = load_transcript_texts(
+            db, [summary.transcript_ref for summary in summaries]
+        )
+    return [summary_item(summary, fields, transcripts) for summary in summaries]
+
+
+def _ranked_summaries(db, channel_ids, limit, options=()):
+    # The latest summaries of each channel, in the keyset order of
+    # read_summaries_by_channel, from one window query over the whole page
+    ranked = (
+        db.query(
+            Summary.id.label("id"),
+            func.row_number()
+            .over(
+                partition_by=Summary.channel_id,
+                order_by=(Summary.created_at.desc(), Summary.id.desc()),
+            )
+            .label("rank"),
+        )
+        .filter(Summary.channel_id.in_(channel_ids))
+        .subquery()
+    )
+    return (
+        db.query(Summary)
+        .options(*options)
+        .join(ranked, ranked.c.id == Summary.id)
+        .filter(ranked.c.rank <= limit)
+        .order_by(Summary.created_at.desc(), Summary.id.desc())
+        .all()
+    )
+
+
+def _latest_summaries(db, channel_ids):
+    latest = _ranked_summaries(db, channel_ids, 1)
+    return {summary.channel_id: summary for summary in latest}
+
+
+def channel_items(db, channels, expand_summaries=False, fields=()):
+    """
+    Build list representations of channels: summary count and latest summary,
+    fetched with two aggregate queries for the whole page of channels.
+
+    Args:
+        db: Database session
+        channels (list): Channel rows
+        expand_summaries (bool): Also include the latest EMBEDDED_SUMMARIES summaries
+            of each channel, metadata plus the requested text fields. When a channel
+            has more, summaries_next_cursor is the cursor of the next page of
+            /summaries/channel/{id}
+        fields (iterable): Text columns to include in expanded summaries
+
+    Returns:
+        list: ChannelItem objects
+    """
+    channel_ids = [channel.id for channel in channels]
+    if not channel_ids:
+        return []
+
+    counts = dict(
+        db.query(Summary.channel_id, func.count(Summary.id))
+        .filter(Summary.channel_id.in_(channel_ids))
+        .group_by(Summary.channel_id)
+        .all()
+    )
+    latest = _latest_summaries(db, channel_ids)
+
+    summaries_by_channel = {}
+    last_rows = {}
+    if expand_summaries:
+        rows = _ranked_summaries(
+            db, channel_ids, get_embedded_summary_limit(), summary_load_options(fields)
+        )
+        for row in rows:
+            last_rows[row.channel_id] = row
+        for item in summary_items(db, rows, fields):
+            summaries_by_channel.setdefault(item.channel_id, []).append(item)
+
+    items = []
+    for channel in channels:
+        data = {
+            "id": channel.id,
+            "project_id": channel.project_id,
+            "label": channel.label,
+            "channel_id": channel.channel_id,
+            "whisper_model": channel.whisper_model,
+            "transcription_engine": channel.transcription_engine,
+            "created_at": channel.created_at,
+            "summary_count": counts.get(channel.id, 0),
+            "latest_summary": (
+                summary_item(latest[channel.id]) if channel.id in latest else None
+            ),
+        }
+        if expand_summaries:
+            summaries = summaries_by_channel.get(channel.id, [])
+            data["summaries"] = summaries
+            if len(summaries) < data["summary_count"]:
+                # Cursor of the stored key, not of the local time serialized above
+                last = last_rows[channel.id]
+                data["summaries_next_cursor"] = encode_cursor(last.created_at, last.id)
+        items.append(ChannelItem(**data))
+    return items
+
+
+def project_items(db, projects, expand_channels=False, expand_summaries=False, fields=()):
+    """
+    Build list representations of projects: channel and summary counts, and the
+    time of the latest summary, from one aggregate query.
+
+    Args:
+        db: Database session
+        projects (list): Project rows
+        expand_channels (bool): Include the channels of each project, see channel_items
+        expand_summaries (bool): Include the latest summaries of the expanded channels
+        fields (iterable): Text columns to include in expanded summaries
+
+    Returns:
+        list: ProjectItem objects
+    """
+    project_ids = [project.id for project in projects]
+    if not project_ids:
+        return []
+
+    stats = {
+        project_id: (channel_count, summary_count, latest_summary_at)
+        for project_id, channel_count, summary_count, latest_summary_at in (
+            db.query(
+                Channel.project_id,
+                func.count(func.distinct(Channel.id)),
+                func.count(Summary.id),
+                func.max(Summary.created_at),
+            )
+            .outerjoin(Summary, Summary.channel_id == Channel.id)
+            .filter(Channel.project_id.in_(project_ids))
+            .group_by(Channel.project_id)
+            .all()
+        )
+    }
+
+    channels_by_project = {}
+    if expand_channels:
+        channels = (
+            db.query(Channel)
+            .filter(Channel.project_id.in_(project_ids))
+            .order_by(Channel.created_at.desc())
+            .all()
+        )
+        for item in channel_items(db, channels, expand_summaries, fields):
+            channels_by_project.setdefault(item.project_id, []).append(item)
+
+    items = []
+    for project in projects:
+        channel_count, summary_count, latest_summary_at = stats.get(
+            project.id, (0, 0, None)
+        )
+        data = {
+            "id": project.id,
+            "name": project.name,
+            "description": project.description,
+            "created_at": project.created_at,
+            "channel_count": channel_count,
+            "summary_count": summary_count,
+            "latest_summary_at": latest_summary_at,
+        }
+        if expand_channels:
+            data["channels"] = channels_by_project.get(project.id, [])
+        items.append(ProjectItem(**data))
+    return items
@@ -1,43 +1,69 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from db.session import get_db
 from db.models.channel import Channel
-from db.schemas.channel import ChannelCreate, ChannelResponse
-from sqlalchemy.orm import joinedload
+from db.schemas.channel import ChannelCreate, ChannelItem, ChannelResponse
+from api.caching import CachedRoute, versioned
+from api.projections import channel_items, parse_options, parse_summary_fields
+from services.resource_versions import CHANNELS, SUMMARIES, bump_versions, channel_key
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.post("/", response_model=ChannelResponse)
 def create_channel(channel: ChannelCreate, db: Session = Depends(get_db)):
     db_channel = Channel(**channel.model_dump())
     db.add(db_channel)
+    db.flush()
+    bump_versions(db, [CHANNELS, channel_key(db_channel.id)])
     db.commit()
     db.refresh(db_channel)
     return db_channel
 
 
-@router.get("/{channel_id}", response_model=ChannelResponse)
-def read_channel(channel_id: int, db: Session = Depends(get_db)):
-    channel = (
-        db.query(Channel)
-        .options(joinedload(Channel.summaries))
-        .filter(Channel.id == channel_id)
-        .first()
-    )
+@router.get("/{channel_id}", response_model=ChannelItem, response_model_exclude_unset=True)
+@versioned(channel_key("{channel_id}"))
+def read_channel(
+    channel_id: int, fields: Optional[str] = None, db: Session = Depends(get_db)
+):
+    """
+    Channel with its latest EMBEDDED_SUMMARIES summaries, newest first. If it has
+    more, pass summaries_next_cursor as cursor to /summaries/channel/{id}.
+
+    Args:
+        fields: Text of each summary to include, "summary" and/or "transcript".
+            Metadata only by default.
+    """
+    fields = parse_summary_fields(fields)
+    channel = db.query(Channel).filter(Channel.id == channel_id).first()
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
-    return channel
+    return channel_items(db, [channel], expand_summaries=True, fields=fields)[0]
+
 
+@router.get("/", response_model=list[ChannelItem], response_model_exclude_unset=True)
+@versioned(CHANNELS, SUMMARIES)
+def read_channels(
+    skip: int = 0,
+    limit: int = 100,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    List channels with their summary count and latest summary.
 
-@router.get("/", response_model=list[ChannelResponse])
-def read_channels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return (
-        db.query(Channel)
-        .options(joinedload(Channel.summaries))
-        .offset(skip)
-        .limit(limit)
-        .all()
+    Args:
+        expand: "summaries" to include the latest summaries of each channel, see
+            read_channel
+        fields: Text of expanded summaries to include, "summary" and/or "transcript"
+    """
+    expand = parse_options(expand, {"summaries"}, "expand")
+    fields = parse_summary_fields(fields)
+    channels = db.query(Channel).offset(skip).limit(limit).all()
+    return channel_items(
+        db, channels, expand_summaries="summaries" in expand, fields=fields
     )
 
 
@@ -47,5 +73,6 @@ def delete_channel(channel_id: int, db: Session = Depends(get_db)):
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     db.delete(channel)
+    bump_versions(db, [CHANNELS, SUMMARIES, channel_key(channel_id)])
     db.commit()
     return {"message": "Channel deleted successfully"}
@@ -1,55 +1,93 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from db.session import get_db
 from db.models.project import Project
-from db.schemas.project import ProjectCreate, ProjectResponse
+from db.schemas.project import ProjectCreate, ProjectItem, ProjectResponse
+from api.caching import CachedRoute, versioned
+from api.projections import parse_options, parse_summary_fields, project_items
+from services.resource_versions import (
+    CHANNELS,
+    PROJECTS,
+    SUMMARIES,
+    bump_versions,
+    channel_key,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.post("/", response_model=ProjectResponse)
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     db_project = Project(**project.model_dump())
     db.add(db_project)
+    bump_versions(db, [PROJECTS])
     db.commit()
     db.refresh(db_project)
     return db_project
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
-def read_project(project_id: int, db: Session = Depends(get_db)):
-    project = (
-        db.query(Project)
-        .options(joinedload(Project.channels))
-        .filter(Project.id == project_id)
-        .first()
-    )
+@router.get("/{project_id}", response_model=ProjectItem, response_model_exclude_unset=True)
+@versioned(PROJECTS, CHANNELS, SUMMARIES)
+def read_project(
+    project_id: int,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Project with its channels, each with a summary count and the latest summary.
+
+    Args:
+        expand: "summaries" to include the latest summaries of each channel, see
+            read_channel
+        fields: Text of expanded summaries to include, "summary" and/or "transcript"
+    """
+    expand = parse_options(expand, {"summaries"}, "expand")
+    fields = parse_summary_fields(fields)
+    project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return project_items(
+        db,
+        [project],
+        expand_channels=True,
+        expand_summaries="summaries" in expand,
+        fields=fields,
+    )[0]
 
 
-@router.get("/", response_model=list[ProjectResponse])
-def read_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return (
-        db.query(Project)
-        .options(joinedload(Project.channels))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+@router.get("/", response_model=list[ProjectItem], response_model_exclude_unset=True)
+@versioned(PROJECTS, CHANNELS, SUMMARIES)
+def read_projects(
+    skip: int = 0,
+    limit: int = 100,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    List projects with channel and summary counts.
 
+    Args:
+        expand: "channels" to include each project's channels, with counts and the
+            latest summary's metadata
+    """
+    expand = parse_options(expand, {"channels"}, "expand")
+    projects = db.query(Project).offset(skip).limit(limit).all()
+    return project_items(db, projects, expand_channels="channels" in expand)
 
-@router.delete("/{project_id}", response_model=ProjectResponse)
+
+@router.delete("/{project_id}", response_model=ProjectItem, response_model_exclude_unset=True)
 def delete_project(project_id: int, db: Session = Depends(get_db)):
-    project = (
-        db.query(Project)
-        .options(joinedload(Project.channels))
-        .filter(Project.id == project_id)
-        .first()
-    )
+    project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    deleted = project_items(db, [project], expand_channels=True)[0]
     db.delete(project)
+    bump_versions(
+        db,
+        [PROJECTS, CHANNELS, SUMMARIES]
+        + [channel_key(channel.id) for channel in project.channels],
+    )
     db.commit()
-    return project
+    return deleted
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from db.session import get_db
+from db.schemas.search import SearchResult
+from api.projections import summary_item
+from services.search import search_summaries
+
+router = APIRouter()
+
+
+def to_utc_naive(value):
+    # created_at is stored as naive UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/", response_model=list[SearchResult], response_model_exclude_unset=True)
+def search(
+    q: str = Query(..., min_length=1, max_length=500),
+    channel_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """
+    Full-text search over summaries and transcripts, best match first.
+
+    Args:
+        q: Search query; supports "quoted phrases", -excluded words and or
+        channel_id: Only this channel
+        project_id: Only the channels of this project
+        since: Only summaries created at or after this time
+        until: Only summaries created before this time
+        limit: Maximum number of results
+    """
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    results = search_summaries(
+        db,
+        q,
+        channel_id=channel_id,
+        project_id=project_id,
+        since=to_utc_naive(since),
+        until=to_utc_naive(until),
+        limit=limit,
+    )
+    return [
+        SearchResult(
+            summary=summary_item(result["summary"], fields=("summary",)),
+            rank=result["rank"],
+            summary_snippet=result["summary_snippet"],
+            transcript_snippet=result["transcript_snippet"],
+        )
+        for result in results
+    ]
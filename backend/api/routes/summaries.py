@@ -1,39 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session, undefer
+from api.caching import CachedRoute, versioned
+from api.pagination import paginate
+from api.projections import parse_summary_fields, summary_items, summary_load_options
 from db.session import get_db
 from db.models.summary import Summary
-from db.schemas.summary import SummaryCreate, SummaryResponse
+from db.schemas.summary import (
+    SummaryCreate,
+    SummaryItem,
+    SummaryResponse,
+    TranscriptResponse,
+)
+from services.resource_versions import (
+    SUMMARIES,
+    bump_versions,
+    channel_key,
+    summary_keys,
+)
+from services.transcript_store import load_transcript, store_transcript_blob
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.post("/", response_model=SummaryResponse)
 def create_summary(summary: SummaryCreate, db: Session = Depends(get_db)):
-    db_summary = Summary(**summary.model_dump())
+    data = summary.model_dump()
+    transcript = data.pop("transcript")
+    db_summary = Summary(**data)
+    if transcript is not None:
+        db_summary.transcript_ref = store_transcript_blob(db, transcript)
     db.add(db_summary)
+    bump_versions(db, summary_keys(db_summary.channel_id))
     db.commit()
     db.refresh(db_summary)
-    return db_summary
+    response = SummaryResponse.model_validate(db_summary)
+    response.transcript = transcript
+    return response
 
 
 @router.get("/{summary_id}", response_model=SummaryResponse)
+@versioned(SUMMARIES)
 def read_summary(summary_id: int, db: Session = Depends(get_db)):
-    summary = db.query(Summary).filter(Summary.id == summary_id).first()
+    summary = (
+        db.query(Summary)
+        .options(undefer(Summary.summary))
+        .filter(Summary.id == summary_id)
+        .first()
+    )
     if not summary:
         raise HTTPException(status_code=404, detail="Summary not found")
-    return summary
+    response = SummaryResponse.model_validate(summary)
+    transcript = load_transcript(db, summary.transcript_ref)
+    response.transcript = transcript["text"] if transcript else None
+    return response
+
+
+@router.get("/{summary_id}/transcript", response_model=TranscriptResponse)
+@versioned(SUMMARIES)
+def read_transcript(summary_id: int, db: Session = Depends(get_db)):
+    """
+    Transcript text and timestamped segments of a summary.
+    """
+    transcript_ref = (
+        db.query(Summary.transcript_ref).filter(Summary.id == summary_id).scalar()
+    )
+    transcript = load_transcript(db, transcript_ref)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    return transcript
+
 
+@router.get("/", response_model=list[SummaryItem], response_model_exclude_unset=True)
+@versioned(SUMMARIES)
+def read_summaries(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    List summaries oldest first. Pass the X-Next-Cursor header of a page as
+    cursor to get the next one.
 
-@router.get("/", response_model=list[SummaryResponse])
-def read_summaries(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return (
-        db.query(Summary).order_by(Summary.created_at).offset(skip).limit(limit).all()
+    Args:
+        fields: Text to include, "summary" and/or "transcript". Metadata only by default.
+    """
+    fields = parse_summary_fields(fields)
+    rows = paginate(
+        db.query(Summary).options(*summary_load_options(fields)),
+        Summary,
+        response,
+        cursor=cursor,
+        limit=limit,
     )
+    return summary_items(db, rows, fields)
 
 
-@router.get("/channel/{channel_id}", response_model=list[SummaryResponse])
-def read_summaries_by_channel(channel_id: int, db: Session = Depends(get_db)):
-    return db.query(Summary).filter(Summary.channel_id == channel_id).all()
+@router.get(
+    "/channel/{channel_id}",
+    response_model=list[SummaryItem],
+    response_model_exclude_unset=True,
+)
+@versioned(channel_key("{channel_id}"))
+def read_summaries_by_channel(
+    channel_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    List the summaries of a channel newest first, paginated like read_summaries.
+    """
+    fields = parse_summary_fields(fields)
+    rows = paginate(
+        db.query(Summary)
+        .options(*summary_load_options(fields))
+        .filter(Summary.channel_id == channel_id),
+        Summary,
+        response,
+        cursor=cursor,
+        limit=limit,
+        descending=True,
+    )
+    return summary_items(db, rows, fields)
+
 
 @router.delete("/{summary_id}")
 def delete_summary(summary_id: int, db: Session = Depends(get_db)):
@@ -42,5 +136,6 @@ def delete_summary(summary_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Summary not found")
     
     db.delete(summary)
+    bump_versions(db, summary_keys(summary.channel_id))
     db.commit()
     return {"message": "Summary deleted successfully"}
\ No newline at end of file
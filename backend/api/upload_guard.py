@@ -0,0 +1,45 @@
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from db.session import AsyncSessionLocal
+from services.audio_io import MULTIPART_OVERHEAD_BYTES, get_max_upload_bytes
+from services.job_queue import QueueFullError, check_queue_capacity
+
+
+async def _check_queue():
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(check_queue_capacity)
+
+
+class UploadGuardRoute(APIRoute):
+    """
+    Route for upload endpoints that turns a request away before any of its body
+    is read. Rejected here:
+    * a Content-Length over MAX_UPLOAD_SIZE_MB (plus multipart framing): 413
+    * any upload while the transcription queue is full: 429 with Retry-After
+
+    A chunked body has no Content-Length; save_upload stops receiving it as
+    soon as it goes over the limit. The endpoint repeats the checks that matter
+    when the job is inserted.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def guarded_handler(request: Request) -> Response:
+            length = request.headers.get("content-length", "")
+            max_bytes = get_max_upload_bytes()
+            if length.isdigit() and int(length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Upload exceeds the maximum size of {max_bytes} bytes",
+                )
+            try:
+                await _check_queue()
+            except QueueFullError as e:
+                raise HTTPException(
+                    status_code=429, detail=str(e), headers={"Retry-After": "30"}
+                )
+            return await handler(request)
+
+        return guarded_handler
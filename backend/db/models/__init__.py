@@ -1,5 +1,9 @@
 from .project import Project
 from .channel import Channel
 from .summary import Summary
+from .cache import TranscriptCache, SummaryCache
+from .transcript_blob import TranscriptBlob
+from .search import SearchDocument
+from .resource_version import ResourceVersion
 
-__all__ = ["Project", "Channel", "Summary"]
+__all__ = ["Project", "Channel", "Summary", "TranscriptCache", "SummaryCache", "TranscriptBlob", "SearchDocument", "ResourceVersion"]
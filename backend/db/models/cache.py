@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from datetime import datetime, timezone
+from db.base import Base
+
+
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+
+    # sha256 of (audio hash, Whisper model, decode options)
+    cache_key = Column(String, primary_key=True)
+    audio_hash = Column(String, nullable=False, index=True)
+    model_name = Column(String, nullable=False)
+    # Text and segments live compressed in the blob store, shared with the Summary
+    transcript_ref = Column(String, ForeignKey("transcript_blobs.hash"), nullable=False)
+    language = Column(String, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class SummaryCache(Base):
+    __tablename__ = "summary_cache"
+
+    # sha256 of (transcript hash, prompt version, Claude model)
+    cache_key = Column(String, primary_key=True)
+    transcript_hash = Column(String, nullable=False, index=True)
+    prompt_version = Column(String, nullable=False)
+    model_name = Column(String, nullable=False)
+    summary = Column(String, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -13,6 +13,10 @@ class Channel(Base):
     )
     label = Column(String, nullable=False)
     channel_id = Column(String, nullable=False)
+    # Whisper model for this channel's recordings, WHISPER_MODEL when unset
+    whisper_model = Column(String, nullable=True)
+    # "whisper" or "ctranslate2", TRANSCRIBE_ENGINE when unset
+    transcription_engine = Column(String, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     project = relationship(
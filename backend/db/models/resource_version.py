@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, BigInteger
+from db.base import Base
+
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+
+    # e.g. "projects", "summaries" or "channel:12", see services.resource_versions
+    key = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
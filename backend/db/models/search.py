@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from db.base import Base
+
+
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index("ix_search_documents_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_search_documents_channel_id_created_at", "channel_id", "created_at"),
+    )
+
+    # Kept apart from summaries so the hot table does not carry the index data
+    summary_id = Column(
+        Integer, ForeignKey("summaries.id", ondelete="CASCADE"), primary_key=True
+    )
+    channel_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    # Summary weighted A, transcript B
+    search_vector = Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=False)
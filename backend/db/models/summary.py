@@ -1,22 +1,45 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Index
 from datetime import datetime, timezone
 from db.base import Base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (
+        # Keyset pagination of a channel's summaries and of all summaries
+        Index("ix_summaries_channel_id_created_at_id", "channel_id", "created_at", "id"),
+        Index("ix_summaries_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_id = Column(Integer, ForeignKey("channels.id"))
     job_id = Column(String, unique=True, index=True)
     original_filename = Column(String)
-    transcript = Column(String, nullable=True)
-    summary = Column(String, nullable=True)
+    # Compressed transcript and segments in transcript_blobs, fetched on demand
+    transcript_ref = Column(String, ForeignKey("transcript_blobs.hash"), nullable=True)
+    # Only loaded when accessed or undeferred, so lists stay light
+    summary = deferred(Column(String, nullable=True))
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     slack_notification_sent = Column(Boolean, default=False)
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
     slack_error = Column(String, nullable=True)
+    # Stage history, percentage and ETA; written on stage changes only
+    progress = Column(JSON, nullable=True)
+    # Segments streamed while transcribing, for clients joining mid-job; cleared on completion
+    partial_segments = deferred(Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True))
+
+    # Durable job queue: inputs needed to (re)run the job, and the worker lease
+    audio_path = Column(String, nullable=True)
+    audio_hash = Column(String, nullable=True, index=True)
+    send_to_slack = Column(Boolean, default=True)
+    # The transcript is cached, the job only summarizes: claimed first, not counted as queued
+    summarize_only = Column(Boolean, default=False, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
 
     channel = relationship("Channel", back_populates="summaries")
 
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Integer, LargeBinary
+from datetime import datetime, timezone
+from db.base import Base
+
+
+class TranscriptBlob(Base):
+    __tablename__ = "transcript_blobs"
+
+    # sha256 of the uncompressed payload, so identical transcripts are stored once
+    hash = Column(String, primary_key=True)
+    codec = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
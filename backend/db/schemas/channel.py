@@ -1,13 +1,49 @@
 from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime, timezone
-from typing import List
-from db.schemas.summary import SummaryResponse
+from typing import List, Optional
+from db.schemas.summary import SummaryItem, SummaryResponse
+
+
+WHISPER_MODELS = {
+    "tiny",
+    "tiny.en",
+    "base",
+    "base.en",
+    "small",
+    "small.en",
+    "medium",
+    "medium.en",
+    "large",
+    "large-v1",
+    "large-v2",
+    "large-v3",
+    "large-v3-turbo",
+    "turbo",
+}
+
+TRANSCRIPTION_ENGINES = {"whisper", "ctranslate2"}
 
 
 class ChannelBase(BaseModel):
     project_id: int
     label: str
     channel_id: str
+    whisper_model: Optional[str] = None
+    transcription_engine: Optional[str] = None
+
+    @field_validator("whisper_model")
+    def validate_whisper_model(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in WHISPER_MODELS:
+            raise ValueError(f"whisper_model must be one of {sorted(WHISPER_MODELS)}")
+        return v
+
+    @field_validator("transcription_engine")
+    def validate_transcription_engine(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in TRANSCRIPTION_ENGINES:
+            raise ValueError(
+                f"transcription_engine must be one of {sorted(TRANSCRIPTION_ENGINES)}"
+            )
+        return v
 
 
 class ChannelCreate(ChannelBase):
@@ -39,3 +75,40 @@ class ChannelResponse(ChannelBase):
             v = v.replace(tzinfo=timezone.utc)
 
         return v.astimezone()
+
+
+class ChannelItem(ChannelBase):
+    """
+    Channel in a list: counts and the latest summary's metadata instead of
+    every summary. summaries is only filled when expanded, with the latest
+    summaries; summaries_next_cursor is then set if the channel has more, to
+    page through /summaries/channel/{id}.
+    """
+
+    id: int
+    created_at: datetime
+    summary_count: int = 0
+    latest_summary: Optional[SummaryItem] = None
+    summaries: List[SummaryItem] = []
+    summaries_next_cursor: Optional[str] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={
+            datetime: lambda dt: (
+                dt.astimezone().isoformat()
+                if dt.tzinfo
+                else dt.replace(tzinfo=timezone.utc).astimezone().isoformat()
+            )
+        },
+    )
+
+    @field_validator("created_at")
+    def convert_datetime_to_local(cls, v: datetime) -> datetime:
+        if v is None:
+            return v
+
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+
+        return v.astimezone()
@@ -2,7 +2,7 @@ from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from db.schemas.channel import ChannelResponse
+from db.schemas.channel import ChannelItem, ChannelResponse
 
 
 class ProjectBase(BaseModel):
@@ -39,3 +39,37 @@ class ProjectResponse(ProjectBase):
             v = v.replace(tzinfo=timezone.utc)
 
         return v.astimezone()
+
+
+class ProjectItem(ProjectBase):
+    """
+    Project in a list: counts only. channels is only filled when expanded.
+    """
+
+    id: int
+    created_at: datetime
+    channel_count: int = 0
+    summary_count: int = 0
+    latest_summary_at: Optional[datetime] = None
+    channels: List[ChannelItem] = []
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={
+            datetime: lambda dt: (
+                dt.astimezone().isoformat()
+                if dt.tzinfo
+                else dt.replace(tzinfo=timezone.utc).astimezone().isoformat()
+            )
+        },
+    )
+
+    @field_validator("created_at", "latest_summary_at")
+    def convert_datetime_to_local(cls, v: datetime) -> datetime:
+        if v is None:
+            return v
+
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+
+        return v.astimezone()
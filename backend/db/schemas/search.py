@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from db.schemas.summary import SummaryItem
+
+
+class SearchResult(BaseModel):
+    summary: SummaryItem
+    rank: float
+    summary_snippet: Optional[str] = None
+    transcript_snippet: Optional[str] = None
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, field_validator, ConfigDict
 from datetime import datetime, timezone
 
@@ -48,3 +48,53 @@ class SummaryResponse(SummaryBase):
         if v not in allowed_statuses:
             raise ValueError(f"Status must be one of {allowed_statuses}")
         return v.lower()
+
+
+class SummaryItem(BaseModel):
+    """
+    Summary in a list: metadata only. The summary and transcript texts are
+    included only when requested through the fields query parameter.
+    """
+
+    id: int
+    job_id: str
+    channel_id: int
+    original_filename: str
+    created_at: datetime
+    status: str
+    slack_notification_sent: Optional[bool] = None
+    slack_error: Optional[str] = None
+    summary: Optional[str] = None
+    transcript: Optional[str] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={
+            datetime: lambda dt: (
+                dt.astimezone().isoformat()
+                if dt.tzinfo
+                else dt.replace(tzinfo=timezone.utc).astimezone().isoformat()
+            )
+        },
+    )
+
+    @field_validator("created_at")
+    def convert_datetime_to_local(cls, v: datetime) -> datetime:
+        if v is None:
+            return v
+
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+
+        return v.astimezone()
+
+
+class TranscriptSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptResponse(BaseModel):
+    text: str
+    segments: List[TranscriptSegment] = []
@@ -1,11 +1,66 @@
+import os
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "postgresql://postgres:postgres@db:5432/summarizer_db"
+DEFAULT_DATABASE_URL = "postgresql://postgres:postgres@db:5432/summarizer_db"
+
+# Async driver used for each sync driver's database
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def get_database_url():
+    return os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+
+
+def get_async_database_url(url=None):
+    """
+    Returns:
+        URL: The database URL with its driver swapped for the asyncio one,
+            e.g. postgresql:// becomes postgresql+asyncpg://
+    """
+    url = make_url(url or get_database_url())
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def pool_options(url):
+    """
+    Connection pool settings shared by the sync and async engines:
+    DB_POOL_SIZE (default 5), DB_MAX_OVERFLOW (default 10), DB_POOL_RECYCLE
+    in seconds (default 1800) and DB_POOL_PRE_PING (default true).
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    Args:
+        url (str): Database URL, SQLite only gets pre-ping
+
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine
+    """
+    options = {"pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        )
+    return options
+
+
+SQLALCHEMY_DATABASE_URL = get_database_url()
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Used by async def handlers, so database I/O never blocks the event loop
+async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL),
+    **pool_options(SQLALCHEMY_DATABASE_URL),
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -13,3 +68,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
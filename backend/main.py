@@ -1,27 +1,66 @@
 import asyncio
 import json
-import subprocess
-from fastapi import FastAPI, Form, Request, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    FastAPI,
+    Request,
+    HTTPException,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import JSONResponse, StreamingResponse
 import os
 import uuid
 from datetime import datetime
-import shutil
 import sys
 from pathlib import Path
 from contextlib import asynccontextmanager
+from sqlalchemy import select
+from db.models.channel import Channel
 from db.models.summary import Summary
 from db.base import Base
-from db.session import engine, get_db
+from db.session import AsyncSessionLocal, async_engine, engine
 
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes.projects import router as projects_router
 from api.routes.channels import router as channels_router
 from api.routes.summaries import router as summaries_router
+from api.routes.search import router as search_router
+from api.upload_guard import UploadGuardRoute
 
 sys.path.append(str(Path(__file__).parent))
-from services.transcribe_summarizer import transcribe_summarize_api
+from services.audio_io import (
+    AudioConversionError,
+    InvalidUploadError,
+    UploadTooLargeError,
+    open_stream_decoder,
+    save_upload,
+)
+from services.job_queue import QueueFullError, enqueue_job
+from services.engines import get_default_engine_name
+from services.model_registry import get_default_model_name, get_preload_model_names
+from services.partial_transcript import PartialTranscript
+from services.worker_pool import TranscriptionPool
+from services.cpu_budget import get_worker_plan
+from services.events import (
+    TERMINAL_STATUSES,
+    PostgresListener,
+    event_bus,
+    get_event_backend,
+    job_status_payload,
+)
+
+
+async def poll_job_queue(pool: TranscriptionPool):
+    """
+    Periodically wake the pool so it picks up jobs left behind by restarts,
+    expired leases, or uploads received by other replicas.
+    """
+    interval = float(os.getenv("JOB_POLL_INTERVAL", "10"))
+    while True:
+        pool.kick()
+        await asyncio.sleep(interval)
 
 
 @asynccontextmanager
@@ -30,9 +69,34 @@ async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
     print(f"Tables created: {list(Base.metadata.tables.keys())}")
 
+    event_bus.attach(asyncio.get_running_loop())
+    listener = None
+    if get_event_backend() == "postgres":
+        listener = PostgresListener(engine.url.render_as_string(hide_password=False))
+        listener.start()
+
+    pool = None
+    poller = None
+    workers, threads = get_worker_plan()
+    if workers > 0:
+        pool = TranscriptionPool(workers, threads)
+        pool.start()
+        poller = asyncio.create_task(poll_job_queue(pool))
+    app.state.transcription_pool = pool
+
     yield
 
     print("Shutting down...")
+    if pool is not None:
+        poller.cancel()
+        await asyncio.to_thread(pool.shutdown)
+    if listener is not None:
+        await asyncio.to_thread(listener.stop)
+    # Live sessions load numpy and their process pool on first use only
+    live = sys.modules.get("services.live")
+    if live is not None:
+        await asyncio.to_thread(live.shutdown_live_executor)
+    await async_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -44,13 +108,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Listed by name too: browsers ignore the wildcard on credentialed requests
+    expose_headers=["*", "X-Next-Cursor"],
 )
 
 
 app.include_router(projects_router, prefix="/projects", tags=["projects"])
 app.include_router(channels_router, prefix="/channels", tags=["channels"])
 app.include_router(summaries_router, prefix="/summaries", tags=["summaries"])
+app.include_router(search_router, prefix="/search", tags=["search"])
+
+
+# Uploads are checked against the queue before their body is received
+upload_router = APIRouter(route_class=UploadGuardRoute)
 
 
 @app.get("/")
@@ -58,155 +128,232 @@ def read_root():
     return {"Hello": "Welcome to Summarizer! Feel free to summarize any recordings"}
 
 
-@app.post("/upload-audio/")
-async def upload_audio(
-    background_tasks: BackgroundTasks,
-    channel_id: int,
-    audio_file: UploadFile = File(...),
-    send_to_slack: str = Form("true"),
-):
+@app.get("/health")
+def health(request: Request):
+    """
+    Readiness of this replica. Answers 503 until every transcription worker has
+    loaded and warmed up its models, so the first job after a deploy runs as fast
+    as any other.
+    """
+    pool = request.app.state.transcription_pool
+    total = pool.max_workers if pool is not None else 0
+    ready_workers = pool.ready_workers if pool is not None else 0
+    ready = ready_workers >= total
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "starting",
+            "model": get_default_model_name(),
+            "preload_models": get_preload_model_names(),
+            "workers": {"total": total, "ready": ready_workers},
+        },
+    )
+
+
+# The body is parsed by save_upload as it arrives, so the form is only described here
+UPLOAD_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["audio_file"],
+                    "properties": {
+                        "audio_file": {"type": "string", "format": "binary"},
+                        "send_to_slack": {"type": "string", "default": "true"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@upload_router.post("/upload-audio/", openapi_extra=UPLOAD_FORM_SCHEMA)
+async def upload_audio(request: Request, channel_id: int):
     """
     Endpoint to upload an audio file and process it using the transcribe_summarize function.
-    Accepts audio files including MP4 and M4A formats, converting them to WAV as needed.
+    Accepts any audio or video format ffmpeg can read, including MP4 and M4A.
+    The file is decoded once, straight to 16 kHz mono, when the job runs.
+
+    The multipart body carries audio_file, the recording, and send_to_slack
+    ("true" by default). It is streamed to disk as it arrives.
+
+    An upload whose transcript and summary are cached from an identical file
+    completes before the response is sent; one whose transcript alone is cached
+    is queued to be summarized only, ahead of the jobs that need Whisper and
+    without counting toward TRANSCRIBE_QUEUE_SIZE.
 
     Args:
-        background_tasks: FastAPI background tasks handler
+        request: The incoming request, whose body is the upload form
         channel_id: The ID of the channel to associate with this upload
-        audio_file: The uploaded audio file
 
     Returns:
-        JSONResponse with job_id and status
+        JSONResponse with job_id, status and queue position (200 if the job is
+        already finished, 202 if queued), or 429 if the queue is full
     """
-    # Accept audio files and video files (for MP4)
-    content_type = audio_file.content_type
-    if not (content_type.startswith("audio/") or content_type.startswith("video/")):
-        raise HTTPException(
-            status_code=400, detail="File must be an audio or video file"
-        )
-
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    job_id = f"standup_{timestamp}_{uuid.uuid4().hex[:8]}"
+    job_id = new_job_id()
 
     # Create temporary directory for processing
     temp_dir = os.getenv("TEMP_DIRECTORY", "/tmp/audio_processing")
     os.makedirs(temp_dir, exist_ok=True)
 
-    # Save original file temporarily
-    file_extension = os.path.splitext(audio_file.filename)[1].lower()
-    if not file_extension:
-        file_extension = ".wav"  # Default to .wav if no extension
-
-    original_filename = audio_file.filename
-    temp_file_path = os.path.join(temp_dir, f"{job_id}_original{file_extension}")
-
-    with open(temp_file_path, "wb") as buffer:
-        shutil.copyfileobj(audio_file.file, buffer)
+    try:
+        upload = await save_upload(request, os.path.join(temp_dir, f"{job_id}_original"))
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    original_filename = upload["filename"]
+    temp_file_path = upload["path"]
+    audio_hash = upload["sha256"]
+    send_to_slack_bool = upload["fields"].get("send_to_slack", "true").lower() == "true"
+    print(f"Saved upload {original_filename} ({upload['size']} bytes, sha256 {audio_hash})")
+
+    from services.transcribe_summarizer import complete_cached_job, find_cached_results
+
+    async with AsyncSessionLocal() as db:
+        cached = await db.run_sync(find_cached_results, channel_id, audio_hash)
+
+    if cached is not None and cached["summary"] is not None:
+        # Same audio transcribed and summarized before: finish the job right here
+        await asyncio.to_thread(
+            complete_cached_job,
+            job_id,
+            channel_id,
+            original_filename,
+            cached["transcription"],
+            send_to_slack_bool,
+            audio_hash,
+        )
+        os.remove(temp_file_path)
+        payload = await load_job_status(job_id)
+        return JSONResponse(
+            status_code=200,
+            content={"job_id": job_id, "queue_position": 0, **payload},
+        )
 
-    if file_extension in [".mp4", ".m4a"]:
-        wav_file_path = os.path.join(temp_dir, f"{job_id}_recording.wav")
+    async with AsyncSessionLocal() as db:
         try:
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-i",
-                    temp_file_path,
-                    "-vn",
-                    "-acodec",
-                    "pcm_s16le",
-                    "-ar",
-                    "44100",
-                    "-ac",
-                    "2",
-                    wav_file_path,
-                ],
-                check=True,
+            # With a cached transcript the job only summarizes, ahead of the queue
+            queue_position = await db.run_sync(
+                enqueue_job,
+                job_id=job_id,
+                channel_id=channel_id,
+                original_filename=original_filename,
+                audio_file_path=temp_file_path,
+                send_to_slack_bool=send_to_slack_bool,
+                audio_hash=audio_hash,
+                summarize_only=cached is not None,
             )
-            audio_file_path = wav_file_path
-        except subprocess.CalledProcessError as e:
+        except QueueFullError as e:
+            os.remove(temp_file_path)
             raise HTTPException(
-                status_code=500, detail=f"Failed to convert audio: {str(e)}"
+                status_code=429, detail=str(e), headers={"Retry-After": "30"}
             )
-    else:
-        audio_file_path = temp_file_path
 
-    db = next(get_db())
-    try:
-        db_summary = Summary(
-            job_id=job_id,
-            channel_id=channel_id,
-            original_filename=original_filename,
-            slack_notification_sent=False, 
-            status="pending",
-        )
-        db.add(db_summary)
-        db.commit()
-        db.refresh(db_summary)
-    finally:
-        db.close()
-
-    background_tasks.add_task(
-        transcribe_summarize_api,
-        audio_file_path=audio_file_path,
-        channel_id=channel_id,
-        original_filename=original_filename,
-        job_id=job_id,
-        send_to_slack_bool=send_to_slack.lower() == "true"
-    )
+    pool = request.app.state.transcription_pool
+    if pool is not None:
+        pool.kick()
 
     return JSONResponse(
         status_code=202,
         content={
             "job_id": job_id,
             "status": "pending",
+            "queue_position": queue_position,
             "message": "Audio file uploaded successfully. Processing started.",
         },
     )
 
 
+app.include_router(upload_router)
+
+
+async def load_job_status(job_id: str):
+    async with AsyncSessionLocal() as db:
+        summary = await db.scalar(select(Summary).where(Summary.job_id == job_id))
+        if not summary:
+            return None
+        return job_status_payload(
+            summary.status,
+            summary_id=summary.id,
+            slack_notification_sent=summary.slack_notification_sent,
+            slack_error=summary.slack_error,
+            progress=summary.progress if summary.status == "processing" else None,
+        )
+
+
+async def load_partial_segments(job_id: str):
+    async with AsyncSessionLocal() as db:
+        return (
+            await db.scalar(
+                select(Summary.partial_segments).where(Summary.job_id == job_id)
+            )
+            or []
+        )
+
+
+def format_sse(payload):
+    """
+    Status updates go out as default messages; other payloads, such as partial
+    transcript segments, as named events so existing onmessage clients ignore them.
+    """
+    event = payload.get("event")
+    if event:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return f"data: {json.dumps(payload)}\n\n"
+
+
 @app.get("/job-events/{job_id}")
 async def job_events(request: Request, job_id: str):
-    async def event_generator():
-        while True:
-            if await request.is_disconnected():
-                print(f"Client disconnected for job {job_id}")
-                break
+    keepalive_interval = float(os.getenv("SSE_KEEPALIVE_INTERVAL", "15"))
+    # The local bus only carries events published in this process; jobs run in
+    # pool or standalone worker processes, so their status is polled instead
+    poll_status = get_event_backend() != "postgres"
+    if poll_status:
+        keepalive_interval = min(
+            keepalive_interval, float(os.getenv("SSE_POLL_INTERVAL", "2"))
+        )
 
-            db = next(get_db())  
-            try:
-                summary = db.query(Summary).filter(Summary.job_id == job_id).first()
-                if not summary:
-                    yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
-                    break
-
-                print(f"Current status for {job_id}: {summary.status}")
-
-                if summary.status == "completed":
-                    payload = json.dumps({
-                        'status': 'completed',
-                        'message': 'Processing complete',
-                        'summary_id': summary.id,
-                        'slack_notification_sent': summary.slack_notification_sent,
-                        'slack_error': getattr(summary, 'slack_error', None)
-                    })
-                    yield f"data: {payload}\n\n"
-                    break
-                elif summary.status == "failed":
-                    payload = json.dumps({
-                        'status': 'failed',
-                        'error': getattr(summary, 'error', 'Unknown error')
-                    })
-                    yield f"data: {payload}\n\n"
-                    break
-                else:
-                    payload = json.dumps({
-                        'status': summary.status,
-                        'message': f'Current status: {summary.status}'
-                    })
-                    yield f"data: {payload}\n\n"
-            finally:
-                db.close() 
-
-            await asyncio.sleep(2)
+    async def event_generator():
+        # Subscribe before reading the current state so no update is missed in between
+        queue = event_bus.subscribe(job_id)
+        try:
+            payload = await load_job_status(job_id)
+            if payload is None:
+                yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if payload.get("status") == "processing":
+                # Catch up on the transcript so far; clients dedupe segments by index
+                segments = await load_partial_segments(job_id)
+                if segments:
+                    yield format_sse({"event": "segment", "segments": segments})
+
+            while True:
+                yield format_sse(payload)
+                if payload.get("status") in TERMINAL_STATUSES:
+                    return
+
+                while True:
+                    try:
+                        payload = await asyncio.wait_for(
+                            queue.get(), timeout=keepalive_interval
+                        )
+                        break
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            print(f"Client disconnected for job {job_id}")
+                            return
+                        if poll_status:
+                            current = await load_job_status(job_id)
+                            if current is not None and current != payload:
+                                payload = current
+                                break
+                        yield ": keepalive\n\n"
+        finally:
+            event_bus.unsubscribe(job_id, queue)
 
     return StreamingResponse(
         event_generator(),
@@ -219,10 +366,188 @@ async def job_events(request: Request, job_id: str):
     )
 
 
+def new_job_id():
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"standup_{timestamp}_{uuid.uuid4().hex[:8]}"
+
+
+async def start_live_job(job_id, channel_id, original_filename, send_to_slack_bool):
+    """
+    Returns:
+        tuple: (Whisper model, transcription engine) of the channel, or None if
+            the channel does not exist
+    """
+    from services.live import create_live_job
+
+    async with AsyncSessionLocal() as db:
+        channel = await db.get(Channel, channel_id)
+        if channel is None:
+            return None
+        await db.run_sync(
+            create_live_job, job_id, channel_id, original_filename, send_to_slack_bool
+        )
+        return (
+            channel.whisper_model or get_default_model_name(),
+            channel.transcription_engine or get_default_engine_name(),
+        )
+
+
+async def finish_live_job(job_id, channel_id, session, partial, send_to_slack_bool):
+    """
+    Transcribe what is left of a live recording, then summarize it.
+
+    Returns:
+        tuple: (transcription or None, status payload of the finished job)
+    """
+    from services.transcribe_summarizer import complete_live_job
+
+    try:
+        transcription = await session.finish()
+    except Exception as e:
+        print(f"Live transcription for job {job_id} failed: {e}")
+        await fail_live_job(job_id, str(e))
+        return None, job_status_payload("failed", slack_error=str(e))
+    await asyncio.to_thread(partial.flush)
+
+    print(
+        f"Live job {job_id}: {session.received_seconds:.0f}s of audio transcribed, summarizing"
+    )
+    await asyncio.to_thread(
+        complete_live_job, job_id, channel_id, transcription, send_to_slack_bool
+    )
+    return transcription, await load_job_status(job_id)
+
+
+async def fail_live_job(job_id, error):
+    from services.transcribe_summarizer import _fail_job
+
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(_fail_job, job_id, [Summary.job_id == job_id], error)
+
+
+def is_stop_message(text):
+    text = text.strip()
+    if text.lower() == "stop":
+        return True
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+@app.websocket("/ws/live/{channel_id}")
+async def live_audio(
+    websocket: WebSocket,
+    channel_id: int,
+    send_to_slack: str = "true",
+    audio_format: str = "auto",
+    filename: str = "live recording",
+):
+    """
+    Live meeting ingestion. The client streams audio as binary messages while
+    the meeting runs, and sends the text message "stop" (or closes the socket)
+    when it ends. Audio is transcribed in rolling windows as it arrives, so only
+    the last window is left to transcribe when the stream closes and the summary
+    follows within seconds.
+
+    Messages sent to the client, as JSON:
+        {"type": "started", "job_id": ...}
+        {"type": "segment", "segments": [...]} after each window
+        {"type": "transcript", "text": ...} once the stream has ended
+        The final job status, as sent over /job-events, then the socket closes
+
+    Args:
+        websocket: The client connection
+        channel_id: The ID of the channel to associate with this meeting
+        send_to_slack: Whether to post the summary to Slack, "true" or "false"
+        audio_format: "pcm_s16le" for raw 16 kHz mono PCM, "auto" for any container
+            ffmpeg can read from a stream (WAV, WebM/Opus, Ogg, ...)
+        filename: Name stored for the recording
+    """
+    from services.live import LiveTranscription, get_live_executor
+
+    await websocket.accept()
+    job_id = new_job_id()
+    send_to_slack_bool = send_to_slack.lower() == "true"
+    model = await start_live_job(job_id, channel_id, filename, send_to_slack_bool)
+    if model is None:
+        await websocket.close(code=1008, reason=f"Channel {channel_id} not found")
+        return
+    await websocket.send_json({"type": "started", "job_id": job_id})
+    print(f"Live job {job_id} started for channel {channel_id}")
+
+    connected = True
+    partial = PartialTranscript(job_id)
+
+    async def on_segments(segments):
+        nonlocal connected
+        # Viewers following /job-events see the transcript grow as well
+        await asyncio.to_thread(partial.add, segments)
+        if not connected:
+            return
+        try:
+            await websocket.send_json({"type": "segment", "segments": segments})
+        except (WebSocketDisconnect, RuntimeError):
+            connected = False
+
+    decoder = open_stream_decoder(audio_format)
+    model_name, engine = model
+    session = LiveTranscription(
+        get_live_executor(), on_segments=on_segments, model_name=model_name, engine=engine
+    )
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                await asyncio.to_thread(decoder.feed, message["bytes"])
+                session.add_audio(decoder.read())
+            elif message.get("text") and is_stop_message(message["text"]):
+                break
+        session.add_audio(await asyncio.to_thread(decoder.close))
+    except AudioConversionError as e:
+        print(f"Live job {job_id}: {e}")
+        await fail_live_job(job_id, str(e))
+        if connected:
+            await websocket.close(code=1003, reason="Audio could not be decoded")
+        return
+    except BaseException:
+        decoder.kill()
+        await fail_live_job(job_id, "Live session aborted")
+        raise
+
+    transcription, payload = await finish_live_job(
+        job_id, channel_id, session, partial, send_to_slack_bool
+    )
+    if not connected:
+        return
+    try:
+        if transcription is not None:
+            await websocket.send_json({"type": "transcript", "text": transcription["text"]})
+        await websocket.send_json(payload)
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+
+
 def main():
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # RELOAD=1 restarts the server on code changes, which needs the app as an import string
+    if os.getenv("RELOAD", "0").lower() in ("1", "true"):
+        backend_dir = str(Path(__file__).parent)
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            app_dir=backend_dir,
+            reload=True,
+            reload_dirs=[backend_dir],
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
 if __name__ == "__main__":
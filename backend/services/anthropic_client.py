@@ -0,0 +1,198 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+from anthropic import APIConnectionError, APIStatusError, AsyncAnthropic
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class _LoopThread:
+    """
+    Event loop running in a daemon thread, so synchronous code (the worker
+    pipeline) can share one async client and its connection pool.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="anthropic-client", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+def _retry_after_seconds(response):
+    """
+    Parse the retry-after header, in seconds or as an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is absent or invalid
+    """
+    if response is None:
+        return None
+    value = response.headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class SummarizationClient:
+    """
+    Process-wide async Anthropic client. Connections are pooled and reused across
+    jobs, in-flight requests are capped by a semaphore, and 429/5xx responses are
+    retried with jittered exponential backoff, honoring retry-after.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        base_url=None,
+        max_concurrency=None,
+        max_retries=None,
+        timeout=None,
+    ):
+        """
+        Args:
+            api_key (str): Anthropic API key
+            base_url (str, optional): API base URL, e.g. a local mock server.
+                Defaults to ANTHROPIC_BASE_URL or the public API.
+            max_concurrency (int, optional): Requests in flight at once in this process.
+                Defaults to ANTHROPIC_MAX_CONCURRENCY.
+            max_retries (int, optional): Retries on retryable errors. Defaults to ANTHROPIC_MAX_RETRIES.
+            timeout (float, optional): Request timeout in seconds. Defaults to ANTHROPIC_TIMEOUT.
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "4"))
+        if max_retries is None:
+            max_retries = int(os.getenv("ANTHROPIC_MAX_RETRIES", "5"))
+        if timeout is None:
+            timeout = float(os.getenv("ANTHROPIC_TIMEOUT", "120"))
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = float(os.getenv("ANTHROPIC_BACKOFF_BASE", "1"))
+        self.backoff_cap = float(os.getenv("ANTHROPIC_BACKOFF_CAP", "60"))
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._blocked_until = 0.0
+        # Never more connections than requests allowed in flight
+        http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            http_client=http_client,
+        )
+
+    def _backoff(self, attempt, error):
+        retry_after = _retry_after_seconds(getattr(error, "response", None))
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    async def create_message(self, **kwargs):
+        """
+        Call messages.create with concurrency limiting and retries.
+
+        Args:
+            **kwargs: Arguments for AsyncAnthropic.messages.create
+
+        Returns:
+            The Message returned by the API
+        """
+        attempt = 0
+        while True:
+            # A rate limit seen by any request pauses every request in this process
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                async with self._semaphore:
+                    return await self.client.messages.create(**kwargs)
+            except (APIStatusError, APIConnectionError) as e:
+                status = getattr(e, "status_code", None)
+                retryable = status is None or status in RETRYABLE_STATUS_CODES
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt, e)
+                if status == 429:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + delay
+                    )
+                attempt += 1
+                print(
+                    f"Anthropic request failed ({status or type(e).__name__}), "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def run(self, coro):
+        """
+        Run a coroutine on the client's event loop from synchronous code.
+
+        Args:
+            coro: Coroutine using this client
+
+        Returns:
+            The coroutine's result
+        """
+        return _get_loop_thread().submit(coro).result()
+
+
+_loop_thread = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def _get_loop_thread():
+    global _loop_thread
+    with _lock:
+        if _loop_thread is None:
+            _loop_thread = _LoopThread()
+        return _loop_thread
+
+
+def get_summarization_client(api_key):
+    """
+    Return the process-wide client for an API key, creating it on first use.
+
+    Args:
+        api_key (str): Anthropic API key
+
+    Returns:
+        SummarizationClient: Shared client
+    """
+    with _lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = SummarizationClient(api_key)
+            _clients[api_key] = client
+        return client
@@ -0,0 +1,519 @@
+import asyncio
+import hashlib
+import os
+import subprocess
+import threading
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SAMPLE_RATE = 16000
+# Multipart framing and form fields sent along with the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+STDERR_TAIL_BYTES = 8 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """
+    Raised when an upload exceeds the configured maximum size
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        super().__init__(f"Upload exceeds the maximum size of {max_bytes} bytes")
+
+
+class InvalidUploadError(Exception):
+    """
+    Raised when an upload request is not a multipart form carrying the expected file
+    """
+
+
+class AudioConversionError(Exception):
+    """
+    Raised when ffmpeg fails to decode an audio file
+    """
+
+
+def get_max_upload_bytes():
+    """
+    Read the maximum accepted upload size from the environment.
+
+    Returns:
+        int: Maximum upload size in bytes
+    """
+    return int(os.getenv("MAX_UPLOAD_SIZE_MB", "500")) * 1024 * 1024
+
+
+def _write_chunk(buffer, hasher, chunk):
+    hasher.update(chunk)
+    buffer.write(chunk)
+
+
+class _MultipartUpload:
+    """
+    python-multipart callbacks that collect the form fields of an upload and
+    hand over the data of its file part as it is parsed, for save_upload to write.
+    """
+
+    def __init__(self, file_field):
+        self.file_field = file_field
+        self.fields = {}
+        self.filename = None
+        self.content_type = None
+        self.file_data = []
+        self._headers = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._name = None
+        self._is_file = False
+        self._value = bytearray()
+
+    def callbacks(self):
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._name = None
+        self._is_file = False
+        self._value = bytearray()
+
+    def on_header_field(self, data, start, end):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if self._name != self.file_field or b"filename" not in options:
+            return
+        if self.filename is not None:
+            raise InvalidUploadError(f"Only one {self.file_field} file is accepted")
+        self._is_file = True
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.content_type = self._headers.get(
+            b"content-type", b"application/octet-stream"
+        ).decode("latin-1")
+
+    def on_part_data(self, data, start, end):
+        if self._is_file:
+            self.file_data.append(data[start:end])
+            return
+        if len(self._value) + end - start > MULTIPART_OVERHEAD_BYTES:
+            raise InvalidUploadError(f"Form field {self._name} is too large")
+        self._value.extend(data[start:end])
+
+    def on_part_end(self):
+        if not self._is_file and self._name:
+            self.fields[self._name] = self._value.decode("utf-8", errors="replace")
+
+
+async def save_upload(
+    request,
+    destination_prefix,
+    file_field="audio_file",
+    content_types=("audio/", "video/"),
+    max_bytes=None,
+):
+    """
+    Receive a multipart upload and stream its file straight to disk without
+    blocking the event loop. The body is parsed as it arrives, so the file is
+    written and its SHA-256 computed in one pass, nothing is spooled first, and
+    max_bytes applies to the bytes received, with or without a Content-Length.
+
+    Args:
+        request (Request): The upload request, whose body has not been read
+        destination_prefix (str): Path to write the file to, without extension; the
+            extension of the uploaded filename (.wav if it has none) is appended
+        file_field (str): Form field carrying the file
+        content_types (tuple): Accepted content type prefixes of the file
+        max_bytes (int, optional): Maximum accepted size. Defaults to MAX_UPLOAD_SIZE_MB.
+
+    Returns:
+        dict: path, filename, content_type, size in bytes, hex sha256 digest, and
+            fields, the other form fields by name
+
+    Raises:
+        UploadTooLargeError: If the upload is larger than max_bytes
+        InvalidUploadError: If the body is not a multipart form with an accepted file
+    """
+    if max_bytes is None:
+        max_bytes = get_max_upload_bytes()
+
+    _, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise InvalidUploadError("Expected a multipart/form-data body")
+
+    upload = _MultipartUpload(file_field)
+    parser = MultipartParser(boundary, upload.callbacks())
+    hasher = hashlib.sha256()
+    size = 0
+    received = 0
+    path = None
+    buffer = None
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise UploadTooLargeError(max_bytes)
+            try:
+                parser.write(chunk)
+            except MultipartParseError as e:
+                raise InvalidUploadError(f"Malformed multipart body: {e}")
+
+            if buffer is None and upload.filename is not None:
+                if not upload.content_type.startswith(content_types):
+                    raise InvalidUploadError("File must be an audio or video file")
+                extension = os.path.splitext(upload.filename)[1].lower() or ".wav"
+                path = f"{destination_prefix}{extension}"
+                buffer = await asyncio.to_thread(open, path, "wb")
+            if upload.file_data:
+                data = b"".join(upload.file_data)
+                upload.file_data.clear()
+                size += len(data)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                await asyncio.to_thread(_write_chunk, buffer, hasher, data)
+        parser.finalize()
+        if buffer is None:
+            raise InvalidUploadError(f"Missing file field {file_field}")
+    except BaseException:
+        if buffer is not None:
+            await asyncio.to_thread(buffer.close)
+            await asyncio.to_thread(_remove_quietly, path)
+        raise
+    await asyncio.to_thread(buffer.close)
+
+    return {
+        "path": path,
+        "filename": upload.filename,
+        "content_type": upload.content_type,
+        "size": size,
+        "sha256": hasher.hexdigest(),
+        "fields": upload.fields,
+    }
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def decode_audio(input_path, sample_rate=SAMPLE_RATE):
+    """
+    Decode any audio or video file into a mono float32 array in a single ffmpeg pass.
+    The PCM stream is piped straight into memory, no intermediate file is written.
+
+    Args:
+        input_path (str): Path to the source file
+        sample_rate (int): Target sample rate, Whisper expects 16 kHz
+
+    Returns:
+        numpy.ndarray: Mono float32 samples in the range [-1, 1]
+
+    Raises:
+        AudioConversionError: If ffmpeg exits with a non-zero status
+    """
+    result = subprocess.run(
+        _ffmpeg_decode_command(input_path, sample_rate),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise _conversion_error(result.returncode, result.stderr)
+
+    return _pcm_to_float(result.stdout)
+
+
+def stream_audio(input_path, block_seconds=30.0, sample_rate=SAMPLE_RATE):
+    """
+    Decode any audio or video file block by block, so that a recording of any
+    length takes a bounded amount of memory. ffmpeg is throttled by the pipe:
+    it only decodes ahead as far as the caller has read.
+
+    Args:
+        input_path (str): Path to the source file
+        block_seconds (float): Audio per block
+        sample_rate (int): Target sample rate, Whisper expects 16 kHz
+
+    Yields:
+        numpy.ndarray: Mono float32 samples, block_seconds at a time, the last block shorter
+
+    Raises:
+        AudioConversionError: If ffmpeg exits with a non-zero status
+    """
+    process = subprocess.Popen(
+        _ffmpeg_decode_command(input_path, sample_rate),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    stderr_tail = _StderrTail(process.stderr)
+    block_bytes = int(block_seconds * sample_rate) * 2
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield _pcm_to_float(data)
+        stderr = stderr_tail.read()
+        if process.wait() != 0:
+            raise _conversion_error(process.returncode, stderr)
+    finally:
+        # The caller stopped early or failed: do not leave ffmpeg blocked on the pipe
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def probe_duration(input_path):
+    """
+    Read the duration of a recording from its container, without decoding it.
+
+    Args:
+        input_path (str): Path to the source file
+
+    Returns:
+        float: Duration in seconds, or None if ffprobe cannot tell
+    """
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            input_path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def _ffmpeg_decode_command(input_path, sample_rate):
+    command = [
+        "ffmpeg",
+        "-loglevel",
+        "error",
+        "-threads",
+        "0",
+        "-i",
+        input_path,
+        "-vn",
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    if input_path != "pipe:0":
+        command.insert(1, "-nostdin")
+    return command
+
+
+def _pcm_to_float(data):
+    # Imported here so the API process can save uploads without loading numpy
+    import numpy as np
+
+    return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def _conversion_error(returncode, stderr):
+    message = stderr.decode(errors="replace").strip().splitlines()
+    return AudioConversionError(
+        f"ffmpeg exited with status {returncode}: "
+        f"{message[-1] if message else 'unknown error'}"
+    )
+
+
+class _StderrTail:
+    """
+    Reads a process's stderr in a thread as it is written, so ffmpeg never
+    blocks on a full pipe, and keeps only the last bytes for error messages.
+    """
+
+    def __init__(self, stream, max_bytes=STDERR_TAIL_BYTES):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._tail = bytearray()
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        while True:
+            data = self._stream.read1(self._max_bytes)
+            if not data:
+                break
+            self._tail.extend(data)
+            del self._tail[: -self._max_bytes]
+
+    def read(self):
+        """
+        Wait for the process to close stderr.
+
+        Returns:
+            bytes: The last STDERR_TAIL_BYTES written
+        """
+        self._thread.join()
+        return bytes(self._tail)
+
+
+class PcmStreamDecoder:
+    """
+    Decoder for a live stream that is already 16-bit little-endian mono PCM
+    at the target rate. Bytes go in through feed(), samples come out of read().
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        self._buffer.extend(data)
+
+    def read(self):
+        """
+        Returns:
+            numpy.ndarray: Float32 samples decoded since the last read
+        """
+        usable = len(self._buffer) - len(self._buffer) % 2
+        data = bytes(self._buffer[:usable])
+        del self._buffer[:usable]
+        return _pcm_to_float(data)
+
+    def close(self):
+        """
+        Returns:
+            numpy.ndarray: The samples still buffered
+        """
+        return self.read()
+
+    def kill(self):
+        self._buffer.clear()
+
+
+class FfmpegStreamDecoder:
+    """
+    Incremental decoder for any container ffmpeg can read from a pipe (WAV, WebM,
+    Ogg, ...). Encoded bytes are written to ffmpeg's stdin, and a reader thread
+    collects the 16 kHz mono output as ffmpeg produces it. feed() may block on
+    the pipe, so async callers run it in a thread.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.process = subprocess.Popen(
+            _ffmpeg_decode_command("pipe:0", sample_rate),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._stderr = _StderrTail(self.process.stderr)
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    def _read_output(self):
+        while True:
+            data = self.process.stdout.read1(UPLOAD_CHUNK_SIZE)
+            if not data:
+                break
+            with self._lock:
+                self._buffer.extend(data)
+
+    def feed(self, data):
+        """
+        Args:
+            data (bytes): Next piece of the encoded stream
+
+        Raises:
+            AudioConversionError: If ffmpeg stopped accepting input
+        """
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            self.process.wait()
+            raise _conversion_error(self.process.returncode, self._stderr.read())
+
+    def read(self):
+        """
+        Returns:
+            numpy.ndarray: Float32 samples decoded since the last read
+        """
+        with self._lock:
+            usable = len(self._buffer) - len(self._buffer) % 2
+            data = bytes(self._buffer[:usable])
+            del self._buffer[:usable]
+        return _pcm_to_float(data)
+
+    def close(self):
+        """
+        Signal the end of the stream and wait for ffmpeg to drain.
+
+        Returns:
+            numpy.ndarray: The remaining samples
+
+        Raises:
+            AudioConversionError: If ffmpeg exits with a non-zero status
+        """
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join()
+        stderr = self._stderr.read()
+        if self.process.wait() != 0:
+            raise _conversion_error(self.process.returncode, stderr)
+        return self.read()
+
+    def kill(self):
+        """
+        Stop ffmpeg without waiting for the rest of the output.
+        """
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+def open_stream_decoder(audio_format):
+    """
+    Create a decoder for a live audio stream.
+
+    Args:
+        audio_format (str): "pcm_s16le" for raw 16 kHz mono PCM, anything else is
+            left to ffmpeg to detect
+
+    Returns:
+        PcmStreamDecoder or FfmpegStreamDecoder
+    """
+    if audio_format == "pcm_s16le":
+        return PcmStreamDecoder()
+    return FfmpegStreamDecoder()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+
+from sqlalchemy.exc import IntegrityError
+
+from db.models.cache import SummaryCache, TranscriptCache
+from .transcript_store import load_transcript, store_transcript_blob
+
+
+def hash_text(text):
+    """
+    Returns:
+        str: Hex SHA-256 of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_key(*parts):
+    return hash_text(json.dumps(parts, sort_keys=True))
+
+
+def transcript_cache_key(audio_hash, model_name, decode_options):
+    """
+    Build the transcript cache key.
+
+    Args:
+        audio_hash (str): SHA-256 of the uploaded file
+        model_name (str): Whisper model used
+        decode_options (dict): Every option that changes the transcript
+
+    Returns:
+        str: Cache key
+    """
+    return _cache_key("transcript", audio_hash, model_name, decode_options)
+
+
+def summary_cache_key(transcript_hash, prompt_version, model_name):
+    """
+    Build the summary cache key.
+
+    Args:
+        transcript_hash (str): SHA-256 of the transcript text
+        prompt_version (str): Version of the summarization prompt
+        model_name (str): Claude model used
+
+    Returns:
+        str: Cache key
+    """
+    return _cache_key("summary", transcript_hash, prompt_version, model_name)
+
+
+def _store(db, entry):
+    try:
+        with db.begin_nested():
+            db.add(entry)
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same entry first
+        db.rollback()
+
+
+def get_cached_transcript(db, cache_key):
+    """
+    Returns:
+        dict: A Whisper-style result with text, segments and language, or None
+    """
+    entry = db.get(TranscriptCache, cache_key)
+    if entry is None:
+        return None
+    transcript = load_transcript(db, entry.transcript_ref)
+    if transcript is None:
+        return None
+    return {
+        "text": transcript["text"],
+        "segments": transcript["segments"],
+        "language": entry.language,
+    }
+
+
+def store_transcript(db, cache_key, audio_hash, model_name, transcription):
+    # Same blob as the Summary row gets, so the transcript is stored once
+    ref = store_transcript_blob(db, transcription["text"], transcription.get("segments"))
+    _store(
+        db,
+        TranscriptCache(
+            cache_key=cache_key,
+            audio_hash=audio_hash,
+            model_name=model_name,
+            transcript_ref=ref,
+            language=transcription.get("language"),
+        ),
+    )
+
+
+def get_cached_summary(db, cache_key):
+    """
+    Returns:
+        str: The cached summary text, or None
+    """
+    entry = db.get(SummaryCache, cache_key)
+    return entry.summary if entry is not None else None
+
+
+def store_summary(db, cache_key, transcript_hash, prompt_version, model_name, summary):
+    _store(
+        db,
+        SummaryCache(
+            cache_key=cache_key,
+            transcript_hash=transcript_hash,
+            prompt_version=prompt_version,
+            model_name=model_name,
+            summary=summary,
+        ),
+    )
+
+
+class SummaryCacheStore:
+    """
+    get/set adapter over the summary cache, used by Summarizer for chunk summaries
+    """
+
+    def __init__(self, db, prompt_version, model_name):
+        self.db = db
+        self.prompt_version = prompt_version
+        self.model_name = model_name
+
+    def get(self, cache_key):
+        return get_cached_summary(self.db, cache_key)
+
+    def set(self, cache_key, transcript_hash, summary):
+        store_summary(
+            self.db, cache_key, transcript_hash, self.prompt_version, self.model_name, summary
+        )
@@ -0,0 +1,150 @@
+import numpy as np
+
+from .audio_io import SAMPLE_RATE
+
+FRAME_SECONDS = 0.03
+SMOOTHING_SECONDS = 0.3
+
+# Characters of the previous window passed to Whisper as context for the next one
+PROMPT_CHARS = 200
+
+
+def frame_energy(audio, sample_rate=SAMPLE_RATE, frame_seconds=FRAME_SECONDS):
+    """
+    Compute the RMS energy of consecutive fixed-size frames.
+
+    Args:
+        audio (numpy.ndarray): Mono float32 samples
+        sample_rate (int): Sample rate of the audio
+        frame_seconds (float): Frame length in seconds
+
+    Returns:
+        tuple: (numpy.ndarray of per-frame RMS, frame length in samples)
+    """
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), frame_length
+
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    return np.sqrt(np.mean(np.square(frames), axis=1)), frame_length
+
+
+def find_split_points(
+    audio, chunk_seconds, search_seconds=15.0, sample_rate=SAMPLE_RATE
+):
+    """
+    Choose chunk boundaries close to every chunk_seconds, moved to the quietest
+    stretch of audio nearby, so a boundary never falls in the middle of a word.
+
+    Args:
+        audio (numpy.ndarray): Mono float32 samples
+        chunk_seconds (float): Target chunk length in seconds
+        search_seconds (float): How far around each target to look for silence
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        list: Sample offsets where the audio should be cut, in increasing order
+    """
+    energy, frame_length = frame_energy(audio, sample_rate)
+    if len(energy) == 0:
+        return []
+
+    # Favour sustained pauses over a single quiet frame between two syllables
+    window = max(1, int(SMOOTHING_SECONDS / FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(window) / window, mode="same")
+
+    frames_per_second = sample_rate / frame_length
+    chunk_frames = int(chunk_seconds * frames_per_second)
+    search_frames = int(search_seconds * frames_per_second)
+
+    splits = []
+    last = 0
+    while len(smoothed) - last > chunk_frames + search_frames:
+        target = last + chunk_frames
+        lo = max(last + 1, target - search_frames)
+        hi = min(len(smoothed), target + search_frames)
+        best = lo + int(np.argmin(smoothed[lo:hi]))
+        splits.append(best * frame_length + frame_length // 2)
+        last = best
+
+    return splits
+
+
+def find_window_cut(window, search_seconds, sample_rate=SAMPLE_RATE):
+    """
+    Choose where a window of a longer recording should end: at the quietest
+    stretch near its end, so the next window starts in a pause.
+
+    Args:
+        window (numpy.ndarray): Mono float32 samples, the longest allowed window
+        search_seconds (float): Half the width of the range searched for a pause
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        int: Length of the window to transcribe, len(window) if it has no pause
+    """
+    # find_split_points only cuts when search_seconds remain after the search
+    # range, so aim 2 * search_seconds before the end: the pause is looked for
+    # between 3 * search_seconds and search_seconds before the end of the window
+    splits = find_split_points(
+        window,
+        chunk_seconds=len(window) / sample_rate - 2 * search_seconds,
+        search_seconds=search_seconds,
+        sample_rate=sample_rate,
+    )
+    return splits[0] if splits else len(window)
+
+
+def split_audio(audio, split_points):
+    """
+    Cut audio at the given sample offsets.
+
+    Args:
+        audio (numpy.ndarray): Mono float32 samples
+        split_points (list): Sample offsets returned by find_split_points
+
+    Returns:
+        list: (start sample, chunk array) tuples covering the audio exactly once
+    """
+    bounds = [0] + list(split_points) + [len(audio)]
+    return [(start, audio[start:end]) for start, end in zip(bounds, bounds[1:])]
+
+
+def stitch_results(chunk_results, sample_rate=SAMPLE_RATE):
+    """
+    Merge per-chunk Whisper results back into a single result, shifting segment
+    timestamps by the chunk offsets.
+
+    Args:
+        chunk_results (list): (start sample, Whisper result) tuples, in audio order
+        sample_rate (int): Sample rate of the audio
+
+    Returns:
+        dict: A Whisper-style result with text, segments and language
+    """
+    segments = []
+    language = None
+    for start, result in chunk_results:
+        offset = start / sample_rate
+        if language is None:
+            language = result.get("language")
+        for segment in result["segments"]:
+            shifted = dict(segment)
+            shifted["id"] = len(segments)
+            shifted["start"] = segment["start"] + offset
+            shifted["end"] = segment["end"] + offset
+            if "seek" in segment:
+                shifted["seek"] = segment["seek"] + int(round(offset * 100))
+            if segment.get("words"):
+                shifted["words"] = [
+                    {**word, "start": word["start"] + offset, "end": word["end"] + offset}
+                    for word in segment["words"]
+                ]
+            segments.append(shifted)
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language,
+    }
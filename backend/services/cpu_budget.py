@@ -0,0 +1,144 @@
+import json
+import os
+
+from .model_registry import model_key
+
+# Read by the OpenMP, MKL and OpenBLAS thread pools when the ML stack is imported
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Threads per job past which a single Whisper decode barely gets faster on CPU,
+# used by TRANSCRIBE_WORKERS=auto until the autotuner has measured this host
+AUTO_THREADS_PER_JOB = 4
+
+# Threads this process was given by apply_budget, None if it may use every core
+_budget_threads = None
+
+
+def available_cores():
+    """
+    Returns:
+        list: Ids of the CPUs this process may run on, sorted
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cpu_count():
+    """
+    Returns:
+        int: Threads this process should keep busy: its budget if one was applied,
+            otherwise CPU_CORES or the number of CPUs it may run on
+    """
+    if _budget_threads is not None:
+        return _budget_threads
+    cores = int(os.getenv("CPU_CORES", "0"))
+    return cores if cores > 0 else len(available_cores())
+
+
+def share_cores(workers):
+    """
+    Returns:
+        int: Threads for each of workers processes sharing this process's cores
+    """
+    return max(1, cpu_count() // max(1, workers))
+
+
+def get_tuning_path():
+    return os.getenv(
+        "CPU_TUNING_FILE",
+        os.path.join(os.getenv("TEMP_DIRECTORY", "/tmp/audio_processing"), "cpu_tuning.json"),
+    )
+
+
+def load_tuning():
+    """
+    Returns:
+        dict: The autotuner's profile for this host's cores and the default
+            model, or None if it has not measured this configuration
+    """
+    try:
+        with open(get_tuning_path()) as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if profile.get("cores") != cpu_count() or profile.get("model") != model_key():
+        return None
+    return profile
+
+
+def save_tuning(profile):
+    path = get_tuning_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+
+
+def get_worker_plan(workers=None):
+    """
+    Split the cores between concurrent transcription jobs, so that jobs running
+    side by side do not each start a thread per core and oversubscribe the CPU.
+
+    Args:
+        workers (int, optional): Jobs run concurrently. Defaults to
+            TRANSCRIBE_WORKERS, a number or "auto" for the autotuned split.
+
+    Returns:
+        tuple: (jobs run concurrently, threads per job), TRANSCRIBE_THREADS
+            overriding the equal share of the cores
+    """
+    threads = int(os.getenv("TRANSCRIBE_THREADS", "0"))
+    if workers is None:
+        setting = os.getenv("TRANSCRIBE_WORKERS", "1").strip().lower()
+        if setting == "auto":
+            profile = load_tuning()
+            if profile is not None:
+                return profile["workers"], threads or profile["threads"]
+            workers = max(1, cpu_count() // AUTO_THREADS_PER_JOB)
+        else:
+            workers = int(setting)
+    if workers <= 0:
+        return 0, 0
+    return workers, threads or share_cores(workers)
+
+
+def affinity_enabled():
+    return os.getenv("CPU_AFFINITY", "false").lower() == "true"
+
+
+def worker_cores(slot, threads):
+    """
+    CPUs for one worker when each worker is pinned to its own cores.
+
+    Args:
+        slot (int): Index of the worker in its pool
+        threads (int): Threads per worker
+
+    Returns:
+        list: threads consecutive CPU ids, wrapping around when the pool has
+            more threads than the process has cores
+    """
+    cores = available_cores()
+    start = slot * threads
+    return [cores[(start + i) % len(cores)] for i in range(min(threads, len(cores)))]
+
+
+def apply_budget(threads, cores=None):
+    """
+    Limit this process to threads intra-op threads, and optionally pin it to
+    cores. Call before the engine imports its ML stack: the thread pools of
+    OpenMP and MKL are sized once, when they start.
+
+    Args:
+        threads (int): Threads the process may use
+        cores (list, optional): CPU ids to pin the process to
+    """
+    global _budget_threads
+    _budget_threads = max(1, threads)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(_budget_threads)
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+        print(f"Process {os.getpid()}: {_budget_threads} threads on CPUs {cores}")
+    else:
+        print(f"Process {os.getpid()}: {_budget_threads} threads")
@@ -0,0 +1,189 @@
+import os
+
+from .shared_weights import load_whisper_shared, shared_weights_enabled
+
+ENGINES = ("whisper", "ctranslate2")
+
+# Audio per Whisper call when the caller follows progress: Whisper has no
+# progress hook, so it is driven one window at a time instead
+PROGRESS_WINDOW_SECONDS = 60
+
+
+def get_default_engine_name():
+    return os.getenv("TRANSCRIBE_ENGINE", "whisper")
+
+
+class WhisperEngine:
+    """
+    The reference implementation: OpenAI Whisper on PyTorch, fp32 on CPU.
+    Weights are memory-mapped and shared by every process on the host unless
+    WHISPER_SHARED_WEIGHTS is false.
+    """
+
+    name = "whisper"
+
+    def __init__(self, model_name, cpu_threads=None):
+        """
+        Args:
+            model_name (str): Whisper model - tiny, base, small, medium, or large
+            cpu_threads (int, optional): Intra-op threads, torch's default if None
+        """
+        import torch
+        import whisper
+
+        if cpu_threads:
+            torch.set_num_threads(cpu_threads)
+        self.model_name = model_name
+        self.shared = shared_weights_enabled()
+        if self.shared:
+            self.model = load_whisper_shared(model_name)
+        else:
+            self.model = whisper.load_model(model_name)
+
+    def memory_bytes(self):
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+    def transcribe(self, audio, initial_prompt=None, report=None, emit=None):
+        """
+        Transcribe audio.
+
+        Args:
+            audio (numpy.ndarray): Mono float32 samples at 16 kHz
+            initial_prompt (str, optional): Text the transcript continues from
+            report (callable, optional): Called with the seconds of audio transcribed so far
+            emit (callable, optional): Called with each window's new segments, times
+                relative to audio
+
+        Returns:
+            dict: Whisper result with text, segments and language
+        """
+        if report is None and emit is None:
+            return self.model.transcribe(audio, initial_prompt=initial_prompt)
+        return self._transcribe_windows(audio, initial_prompt, report, emit)
+
+    def _transcribe_windows(self, audio, initial_prompt=None, report=None, emit=None):
+        """
+        Transcribe audio in windows of about PROGRESS_WINDOW_SECONDS cut at
+        pauses, reporting after each one. Every window gets the end of the
+        previous window's text as its prompt, as Whisper does between its own
+        30-second windows, so the transcript reads the same.
+        """
+        from .audio_io import SAMPLE_RATE
+        from .chunking import PROMPT_CHARS, find_window_cut, stitch_results
+
+        window_samples = int(PROGRESS_WINDOW_SECONDS * SAMPLE_RATE)
+        results = []
+        prompt = initial_prompt
+        start = 0
+        while start < len(audio):
+            rest = audio[start:]
+            # Keep the last window whole rather than leaving a short tail
+            length = len(rest)
+            if length > window_samples * 3 // 2:
+                length = find_window_cut(rest[:window_samples], search_seconds=5.0)
+            result = self.model.transcribe(rest[:length], initial_prompt=prompt)
+            results.append((start, result))
+            if emit is not None and result["segments"]:
+                emit(stitch_results([(start, result)])["segments"])
+            start += length
+            if report is not None:
+                report(start / SAMPLE_RATE)
+            prompt = result["text"][-PROMPT_CHARS:].strip() or prompt
+        return stitch_results(results)
+
+
+class CTranslate2Engine:
+    """
+    Whisper converted to CTranslate2 (faster-whisper), with int8 weights on CPU
+    by default. Same models and output format as WhisperEngine, several times
+    the throughput on CPU.
+    """
+
+    name = "ctranslate2"
+
+    def __init__(self, model_name, cpu_threads=None):
+        """
+        Args:
+            model_name (str): Whisper model name, or a directory holding a converted model
+            cpu_threads (int, optional): Intra-op threads, CTranslate2's default if None
+        """
+        from faster_whisper import WhisperModel
+        from faster_whisper.utils import download_model
+
+        self.model_name = model_name
+        self.compute_type = os.getenv("CT2_COMPUTE_TYPE", "int8")
+        self.beam_size = int(os.getenv("CT2_BEAM_SIZE", "1"))
+        self.path = model_name if os.path.isdir(model_name) else download_model(model_name)
+        self.model = WhisperModel(
+            self.path,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=cpu_threads or 0,
+        )
+
+    def memory_bytes(self):
+        # Converted checkpoints are float16; int8 weights take half of that in memory
+        size = os.path.getsize(os.path.join(self.path, "model.bin"))
+        return size // 2 if self.compute_type.startswith("int8") else size
+
+    def transcribe(self, audio, initial_prompt=None, report=None, emit=None):
+        """
+        Transcribe audio, see WhisperEngine.transcribe. Greedy decoding
+        (CT2_BEAM_SIZE=1) like whisper.transcribe, with the same temperature
+        fallback and conditioning on the previous text.
+
+        Returns:
+            dict: Whisper-style result with text, segments and language
+        """
+        segment_iterator, info = self.model.transcribe(
+            audio,
+            beam_size=self.beam_size,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=True,
+        )
+        segments = []
+        for segment in segment_iterator:
+            item = {
+                "id": len(segments),
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            segments.append(item)
+            if emit is not None:
+                emit([item])
+            if report is not None:
+                report(min(segment.end, info.duration))
+        if report is not None:
+            report(info.duration)
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+def load_engine(engine_name, model_name, cpu_threads=None):
+    """
+    Load a model on a transcription engine.
+
+    Args:
+        engine_name (str): "whisper" or "ctranslate2"
+        model_name (str): Whisper model name
+        cpu_threads (int, optional): Threads the engine may use
+
+    Returns:
+        WhisperEngine or CTranslate2Engine: The loaded engine
+    """
+    if engine_name == "whisper":
+        return WhisperEngine(model_name, cpu_threads)
+    if engine_name == "ctranslate2":
+        return CTranslate2Engine(model_name, cpu_threads)
+    raise ValueError(f"Unknown transcription engine: {engine_name}")
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+import select
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event, text
+
+JOB_EVENTS_CHANNEL = "job_events"
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class EventBus:
+    """
+    In-process publish/subscribe of job events, keyed by job id.
+    Subscribers are asyncio queues living on the API event loop.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._loop = None
+
+    def attach(self, loop):
+        """
+        Bind the bus to the event loop that owns the subscriber queues.
+        """
+        self._loop = loop
+
+    def subscribe(self, job_id):
+        """
+        Returns:
+            asyncio.Queue: Receives every event published for job_id
+        """
+        queue = asyncio.Queue()
+        self._subscribers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_id, queue):
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[job_id]
+
+    def dispatch(self, job_id, payload):
+        """
+        Deliver an event to the subscribers of job_id. Must run on the bus loop.
+        """
+        for queue in list(self._subscribers.get(job_id, ())):
+            queue.put_nowait(payload)
+
+    def dispatch_threadsafe(self, job_id, payload):
+        """
+        Deliver an event from any thread.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.dispatch, job_id, payload)
+
+
+event_bus = EventBus()
+
+
+def job_status_payload(
+    status, summary_id=None, slack_notification_sent=None, slack_error=None, progress=None
+):
+    """
+    Build the status event sent to SSE clients.
+
+    Args:
+        status (str): Job status
+        summary_id (int, optional): ID of the Summary row, for completed jobs
+        slack_notification_sent (bool, optional): Whether Slack was notified
+        slack_error (str, optional): Slack error, or the failure reason of a failed job
+        progress (dict, optional): Stage, percentage and ETA of a running job
+
+    Returns:
+        dict: Event payload
+    """
+    if status == "completed":
+        return {
+            "status": "completed",
+            "message": "Processing complete",
+            "summary_id": summary_id,
+            "slack_notification_sent": slack_notification_sent,
+            "slack_error": slack_error,
+        }
+    if status == "failed":
+        return {"status": "failed", "error": slack_error or "Unknown error"}
+    payload = {"status": status, "message": f"Current status: {status}"}
+    if progress:
+        payload.update(progress)
+    return payload
+
+
+def get_event_backend(db_url=None):
+    """
+    Choose how events travel from workers to SSE handlers.
+
+    Returns:
+        str: "postgres" for LISTEN/NOTIFY across processes and replicas, or "local"
+            for the in-process bus only (single process, tests)
+    """
+    backend = os.getenv("EVENT_BACKEND")
+    if backend:
+        return backend
+    if db_url is None:
+        from db.session import engine
+
+        db_url = engine.url.render_as_string()
+    return "postgres" if db_url.startswith("postgresql") else "local"
+
+
+def publish_job_event(db, job_id, payload):
+    """
+    Publish a job event, delivered when the session's current transaction commits,
+    so subscribers never see a state that was rolled back.
+
+    Args:
+        db: Database session holding the status change
+        job_id (str): Job identifier
+        payload (dict): Event body, sent to SSE clients as is
+    """
+    message = dict(payload, job_id=job_id)
+    if get_event_backend(db.get_bind().url.render_as_string()) == "postgres":
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": JOB_EVENTS_CHANNEL, "payload": json.dumps(message)},
+        )
+    else:
+        event.listen(
+            db,
+            "after_commit",
+            lambda session: event_bus.dispatch_threadsafe(job_id, message),
+            once=True,
+        )
+
+
+class PostgresListener:
+    """
+    Thread that LISTENs on the job events channel and forwards every
+    notification to the in-process bus. Idle cost is one open connection.
+    """
+
+    def __init__(self, dsn, bus=event_bus):
+        self.dsn = dsn
+        self.bus = bus
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="job-events-listener", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        import psycopg2
+
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except Exception as e:
+                print(f"Job events listener failed to connect: {e}")
+                self._stop.wait(5)
+                continue
+
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {JOB_EVENTS_CHANNEL}")
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._forward(notify.payload)
+            except Exception as e:
+                print(f"Job events listener lost its connection: {e}")
+                self._stop.wait(1)
+            finally:
+                conn.close()
+
+    def _forward(self, raw):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        self.bus.dispatch_threadsafe(message.get("job_id"), message)
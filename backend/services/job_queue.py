@@ -0,0 +1,391 @@
+import os
+import select
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import and_, func, or_, text
+
+from db.models.summary import Summary
+from db.session import get_db
+from .events import get_event_backend, job_status_payload, publish_job_event
+from .resource_versions import bump_versions, summary_keys
+
+
+JOB_QUEUE_CHANNEL = "job_queue"
+
+
+class QueueFullError(Exception):
+    """
+    Raised when too many jobs are already waiting for a worker
+    """
+
+
+class LeaseLostError(Exception):
+    """
+    Raised when a worker's lease on its job expired and another worker may own it
+    """
+
+
+def get_worker_id():
+    """
+    Build an identifier for the current worker process, unique across hosts.
+
+    Returns:
+        str: hostname:pid of the current process
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def get_lease_seconds():
+    return int(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+
+def get_max_attempts():
+    return int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+
+def get_max_queue_size():
+    return int(os.getenv("TRANSCRIBE_QUEUE_SIZE", "20"))
+
+
+def _queued_jobs(db, summarize_only=False):
+    return db.query(Summary).filter(
+        Summary.status == "pending",
+        Summary.audio_path.isnot(None),
+        Summary.summarize_only.is_(summarize_only),
+    )
+
+
+def count_queued_jobs(db):
+    """
+    Count the jobs waiting for a worker across every replica. Summarize-only
+    jobs do not count: they reuse a cached transcript and are claimed first.
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Number of pending jobs
+    """
+    return _queued_jobs(db).count()
+
+
+def check_queue_capacity(db):
+    """
+    Returns:
+        int: Number of jobs waiting for a worker
+
+    Raises:
+        QueueFullError: If TRANSCRIBE_QUEUE_SIZE jobs are already waiting
+    """
+    queued = count_queued_jobs(db)
+    if queued >= get_max_queue_size():
+        raise QueueFullError(f"Transcription queue is full ({queued} jobs waiting)")
+    return queued
+
+
+def enqueue_job(
+    db,
+    job_id,
+    channel_id,
+    original_filename,
+    audio_file_path,
+    send_to_slack_bool,
+    audio_hash=None,
+    summarize_only=False,
+):
+    """
+    Persist a new job on the summaries table, where any worker can claim it.
+
+    Args:
+        db: Database session
+        job_id (str): Public job identifier
+        channel_id (int): Channel the recording belongs to
+        original_filename (str): Name of the uploaded file
+        audio_file_path (str): Path of the uploaded file, on storage shared by the workers
+        send_to_slack_bool (bool): Whether to post the summary to Slack
+        audio_hash (str, optional): SHA-256 of the uploaded file
+        summarize_only (bool): The transcript of the file is cached. The job skips
+            the queue limit and goes ahead of the jobs that need Whisper.
+
+    Returns:
+        int: Number of jobs ahead of this one in the queue
+
+    Raises:
+        QueueFullError: If TRANSCRIBE_QUEUE_SIZE jobs are already waiting
+    """
+    if summarize_only:
+        queued = _queued_jobs(db, summarize_only=True).count()
+    else:
+        queued = check_queue_capacity(db) + _queued_jobs(db, summarize_only=True).count()
+
+    db_summary = Summary(
+        job_id=job_id,
+        channel_id=channel_id,
+        original_filename=original_filename,
+        audio_path=audio_file_path,
+        audio_hash=audio_hash,
+        send_to_slack=send_to_slack_bool,
+        summarize_only=summarize_only,
+        slack_notification_sent=False,
+        status="pending",
+    )
+    db.add(db_summary)
+    bump_versions(db, summary_keys(channel_id))
+    notify_job_queued(db)
+    db.commit()
+    return queued
+
+
+def notify_job_queued(db):
+    """
+    Wake standalone workers waiting in JobQueueWaiter when the transaction commits.
+    """
+    if get_event_backend(db.get_bind().url.render_as_string()) == "postgres":
+        db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": JOB_QUEUE_CHANNEL})
+
+
+class JobQueueWaiter:
+    """
+    Lets an idle standalone worker sleep until a job is queued instead of
+    polling: it LISTENs on the job queue channel, and returns early when
+    enqueue_job notifies it. Without Postgres it just sleeps.
+    """
+
+    def __init__(self, dsn=None):
+        """
+        Args:
+            dsn (str, optional): Database to listen on. Defaults to the engine's
+                database when the event backend is postgres.
+        """
+        if dsn is None and get_event_backend() == "postgres":
+            from db.session import engine
+
+            dsn = engine.url.render_as_string(hide_password=False)
+        self.dsn = dsn
+        self._conn = None
+
+    def wait(self, timeout):
+        """
+        Block until a job is queued or timeout seconds have passed.
+        """
+        conn = self._connect()
+        if conn is None:
+            time.sleep(timeout)
+            return
+        try:
+            if select.select([conn], [], [], timeout) != ([], [], []):
+                conn.poll()
+                conn.notifies.clear()
+        except Exception as e:
+            print(f"Job queue listener lost its connection: {e}")
+            self.close()
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn = None
+
+    def _connect(self):
+        if self._conn is not None or self.dsn is None:
+            return self._conn
+        import psycopg2
+
+        try:
+            conn = psycopg2.connect(self.dsn)
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {JOB_QUEUE_CHANNEL}")
+        except Exception as e:
+            print(f"Job queue listener failed to connect: {e}")
+            return None
+        self._conn = conn
+        return conn
+
+
+def claim_next_job(db, worker_id, lease_seconds=None):
+    """
+    Claim the oldest pending job, or a processing job whose lease expired.
+    Summarize-only jobs come first, they take seconds. Rows are locked with
+    FOR UPDATE SKIP LOCKED, so concurrent workers never claim the same job.
+    Jobs that already used up JOB_MAX_ATTEMPTS are marked failed.
+
+    Args:
+        db: Database session
+        worker_id (str): Identifier of the claiming worker
+        lease_seconds (int, optional): Lease duration. Defaults to JOB_LEASE_SECONDS.
+
+    Returns:
+        Summary: The claimed job, or None if nothing is available
+    """
+    if lease_seconds is None:
+        lease_seconds = get_lease_seconds()
+    max_attempts = get_max_attempts()
+
+    while True:
+        job = (
+            db.query(Summary)
+            .filter(
+                Summary.audio_path.isnot(None),
+                or_(
+                    Summary.status == "pending",
+                    and_(
+                        Summary.status == "processing",
+                        Summary.lease_expires_at < func.now(),
+                    ),
+                ),
+            )
+            .order_by(Summary.summarize_only.desc(), Summary.created_at, Summary.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.rollback()
+            return None
+
+        if (job.attempts or 0) >= max_attempts:
+            print(f"Job {job.job_id} gave up after {job.attempts} attempts")
+            job.status = "failed"
+            job.slack_error = f"Processing abandoned after {job.attempts} attempts"
+            job.lease_owner = None
+            job.lease_expires_at = None
+            publish_job_event(
+                db, job.job_id, job_status_payload("failed", slack_error=job.slack_error)
+            )
+            bump_versions(db, summary_keys(job.channel_id))
+            db.commit()
+            continue
+
+        if job.status == "processing":
+            print(f"Reclaiming job {job.job_id} from expired lease of {job.lease_owner}")
+
+        job.status = "processing"
+        job.attempts = (job.attempts or 0) + 1
+        job.lease_owner = worker_id
+        job.lease_expires_at = func.now() + timedelta(seconds=lease_seconds)
+        job.heartbeat_at = func.now()
+        job.partial_segments = None
+        publish_job_event(db, job.job_id, job_status_payload("processing"))
+        bump_versions(db, summary_keys(job.channel_id))
+        db.commit()
+        db.refresh(job)
+        return job
+
+
+def renew_lease(db, job_id, worker_id, lease_seconds=None):
+    """
+    Extend the lease of a job held by this worker.
+
+    Args:
+        db: Database session
+        job_id (str): Job identifier
+        worker_id (str): Identifier of the worker holding the lease
+        lease_seconds (int, optional): Lease duration. Defaults to JOB_LEASE_SECONDS.
+
+    Returns:
+        bool: False if the lease was lost to another worker
+    """
+    if lease_seconds is None:
+        lease_seconds = get_lease_seconds()
+
+    updated = (
+        db.query(Summary)
+        .filter(
+            Summary.job_id == job_id,
+            Summary.lease_owner == worker_id,
+            Summary.status == "processing",
+        )
+        .update(
+            {
+                "lease_expires_at": func.now() + timedelta(seconds=lease_seconds),
+                "heartbeat_at": func.now(),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated == 1
+
+
+class LeaseHeartbeat:
+    """
+    Background thread that keeps renewing a job lease while the job runs
+    """
+
+    def __init__(self, job_id, worker_id, lease_seconds=None):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or get_lease_seconds()
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _run(self):
+        interval = max(1, self.lease_seconds // 3)
+        while not self._stop.wait(interval):
+            db = next(get_db())
+            try:
+                if not renew_lease(db, self.job_id, self.worker_id, self.lease_seconds):
+                    print(f"Lost lease on job {self.job_id}")
+                    self.lost.set()
+                    return
+            except Exception as e:
+                print(f"Failed to renew lease on job {self.job_id}: {e}")
+            finally:
+                db.close()
+
+
+def run_next_job(worker_id=None):
+    """
+    Claim one job and process it to completion while heartbeating its lease.
+
+    Args:
+        worker_id (str, optional): Identifier of this worker. Defaults to hostname:pid.
+
+    Returns:
+        str: The processed job id, or None if the queue was empty
+    """
+    from .transcribe_summarizer import transcribe_summarize_api
+
+    if worker_id is None:
+        worker_id = get_worker_id()
+
+    db = next(get_db())
+    try:
+        job = claim_next_job(db, worker_id)
+        if job is None:
+            return None
+        job_args = {
+            "audio_file_path": job.audio_path,
+            "channel_id": job.channel_id,
+            "original_filename": job.original_filename,
+            "job_id": job.job_id,
+            "send_to_slack_bool": bool(job.send_to_slack),
+            "audio_hash": job.audio_hash,
+        }
+    finally:
+        db.close()
+
+    print(f"Worker {worker_id} claimed job {job_args['job_id']}")
+    with LeaseHeartbeat(job_args["job_id"], worker_id) as heartbeat:
+        try:
+            transcribe_summarize_api(
+                **job_args, worker_id=worker_id, lease_lost=heartbeat.lost
+            )
+        except Exception as e:
+            print(f"Job {job_args['job_id']} failed: {e}")
+
+    return job_args["job_id"]
@@ -0,0 +1,211 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from db.models.summary import Summary
+from .audio_io import SAMPLE_RATE
+from .chunking import PROMPT_CHARS, find_window_cut, stitch_results
+from .cpu_budget import apply_budget, share_cores
+from .engines import get_default_engine_name
+from .model_registry import get_default_model_name, registry
+from .resource_versions import bump_versions, summary_keys
+
+
+def _init_live_worker(engine_name, model_name, num_threads):
+    """
+    Load and warm up the default model in a live transcription process. The
+    engine imports its ML stack here, so the API process itself never loads it.
+    """
+    apply_budget(num_threads)
+    registry.cpu_threads = num_threads
+    registry.get(model_name, engine_name)
+
+
+def _transcribe_window(engine_name, model_name, audio, initial_prompt=None):
+    return registry.get(model_name, engine_name).transcribe(
+        audio, initial_prompt=initial_prompt
+    )
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_live_executor():
+    """
+    Return the process pool transcribing live windows, starting it on first use.
+    Sized by LIVE_WORKERS, each worker gets an equal share of the cores.
+
+    Returns:
+        ProcessPoolExecutor: Shared pool
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, int(os.getenv("LIVE_WORKERS", "1")))
+            threads = share_cores(workers)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_live_worker,
+                initargs=(get_default_engine_name(), get_default_model_name(), threads),
+            )
+        return _executor
+
+
+def shutdown_live_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+def create_live_job(db, job_id, channel_id, original_filename, send_to_slack_bool):
+    """
+    Create the Summary row of a live session. It has no audio_path, so queue
+    workers never claim it: the API process that owns the stream completes it.
+
+    Args:
+        db: Database session
+        job_id (str): Public job identifier
+        channel_id (int): Channel the meeting belongs to
+        original_filename (str): Name shown for the recording
+        send_to_slack_bool (bool): Whether to post the summary to Slack
+    """
+    db.add(
+        Summary(
+            job_id=job_id,
+            channel_id=channel_id,
+            original_filename=original_filename,
+            send_to_slack=send_to_slack_bool,
+            slack_notification_sent=False,
+            status="processing",
+        )
+    )
+    bump_versions(db, summary_keys(channel_id))
+    db.commit()
+
+
+class LiveTranscription:
+    """
+    Rolling-window transcription of a recording that is still being made.
+    Audio accumulates until a window is full; the window is then cut at the
+    quietest moment near its end and transcribed while more audio arrives, with
+    the end of the previous window's text as context. Only the audio not yet
+    transcribed and the per-window results are kept in memory.
+    """
+
+    def __init__(
+        self,
+        executor,
+        on_segments=None,
+        window_seconds=None,
+        search_seconds=None,
+        model_name=None,
+        engine=None,
+    ):
+        """
+        Args:
+            executor: Pool running _transcribe_window, see get_live_executor
+            on_segments (callable, optional): Coroutine function receiving each
+                window's segments, with times in the recording
+            window_seconds (float, optional): Audio per window. Defaults to LIVE_WINDOW_SECONDS.
+            search_seconds (float, optional): How far before the end of a window to look
+                for a pause to cut at. Defaults to LIVE_SEARCH_SECONDS.
+            model_name (str, optional): Whisper model. Defaults to WHISPER_MODEL.
+            engine (str, optional): Transcription engine. Defaults to TRANSCRIBE_ENGINE.
+        """
+        if window_seconds is None:
+            window_seconds = float(os.getenv("LIVE_WINDOW_SECONDS", "30"))
+        if search_seconds is None:
+            search_seconds = float(os.getenv("LIVE_SEARCH_SECONDS", "5"))
+        self.executor = executor
+        self.model_name = model_name or get_default_model_name()
+        self.engine_name = engine or get_default_engine_name()
+        self.on_segments = on_segments
+        self.window_samples = int(window_seconds * SAMPLE_RATE)
+        self.search_seconds = min(search_seconds, window_seconds / 2)
+        self.results = []
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._offset = 0
+        self._task = None
+
+    @property
+    def received_seconds(self):
+        return (self._offset + len(self._pending)) / SAMPLE_RATE
+
+    def add_audio(self, samples):
+        """
+        Append decoded samples and start transcribing if a window is full.
+
+        Args:
+            samples (numpy.ndarray): Mono float32 samples at 16 kHz
+        """
+        if len(samples) == 0:
+            return
+        self._pending = np.concatenate((self._pending, samples))
+        if self._task is not None and self._task.done():
+            # Surface a failed window instead of transcribing past it
+            self._task.result()
+            self._task = None
+        if self._task is None and len(self._pending) >= self.window_samples:
+            self._task = asyncio.create_task(self._drain())
+
+    async def finish(self):
+        """
+        Transcribe the remaining audio once the stream has ended.
+
+        Returns:
+            dict: Whisper-style result for the whole recording
+        """
+        if self._task is not None:
+            await self._task
+            self._task = None
+        if len(self._pending) > 0:
+            await self._transcribe_next(len(self._pending))
+        return stitch_results(self.results)
+
+    async def _drain(self):
+        while len(self._pending) >= self.window_samples:
+            await self._transcribe_next(self._cut_point())
+
+    def _cut_point(self):
+        return find_window_cut(self._pending[: self.window_samples], self.search_seconds)
+
+    async def _transcribe_next(self, length):
+        window = self._pending[:length]
+        self._pending = self._pending[length:]
+        start = self._offset
+        self._offset += length
+
+        prompt = None
+        if self.results:
+            prompt = self.results[-1][1]["text"][-PROMPT_CHARS:].strip() or None
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.executor,
+            _transcribe_window,
+            self.engine_name,
+            self.model_name,
+            window,
+            prompt,
+        )
+        self.results.append((start, result))
+
+        if self.on_segments is not None:
+            offset = start / SAMPLE_RATE
+            segments = [
+                {
+                    "start": round(segment["start"] + offset, 2),
+                    "end": round(segment["end"] + offset, 2),
+                    "text": segment["text"].strip(),
+                }
+                for segment in result["segments"]
+            ]
+            if segments:
+                await self.on_segments(segments)
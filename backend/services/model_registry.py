@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .audio_io import SAMPLE_RATE
+from .engines import get_default_engine_name, load_engine
+
+# Seconds of synthetic audio transcribed once per loaded model
+WARMUP_SECONDS = 2.0
+
+
+def get_default_model_name():
+    return os.getenv("WHISPER_MODEL", "base")
+
+
+def model_key(name=None, engine=None):
+    """
+    Returns:
+        str: "engine:model", defaulting to TRANSCRIBE_ENGINE and WHISPER_MODEL
+    """
+    return f"{engine or get_default_engine_name()}:{name or get_default_model_name()}"
+
+
+def get_preload_model_names():
+    """
+    Returns:
+        list: Keys of WHISPER_MODEL followed by the extra models in
+            WHISPER_PRELOAD_MODELS (comma separated, "small" or
+            "ctranslate2:small"), without duplicates
+    """
+    keys = [model_key()]
+    for entry in os.getenv("WHISPER_PRELOAD_MODELS", "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        engine, _, name = entry.rpartition(":")
+        key = model_key(name, engine or None)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _warmup_clip(seconds=WARMUP_SECONDS):
+    import numpy as np
+
+    # A quiet tone: silence would be skipped by Whisper's no-speech check
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (0.1 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32)
+
+
+class ModelRegistry:
+    """
+    Transcription models loaded in this process, by engine and name. Models are
+    loaded on first use, warmed up with a short synthetic clip so the first real
+    job does not pay for lazy initialization, and evicted least recently used
+    first when the loaded models exceed WHISPER_MODEL_MEMORY_MB. Engines import
+    their ML stack on first load, so importing the registry stays cheap.
+    """
+
+    def __init__(self, memory_budget_mb=None):
+        """
+        Args:
+            memory_budget_mb (float, optional): Memory the loaded models may use,
+                0 for no limit. Defaults to WHISPER_MODEL_MEMORY_MB.
+        """
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("WHISPER_MODEL_MEMORY_MB", "4096"))
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        # Threads given to engines loaded from now on, set by pool initializers
+        self.cpu_threads = None
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self):
+        """
+        list: Keys of the loaded models, least recently used first
+        """
+        with self._lock:
+            return list(self._models)
+
+    @property
+    def memory_used(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def get(self, name=None, engine=None):
+        """
+        Return a loaded model, loading and warming it up if needed.
+
+        Args:
+            name (str, optional): Whisper model name. Defaults to WHISPER_MODEL.
+            engine (str, optional): Transcription engine. Defaults to TRANSCRIBE_ENGINE.
+
+        Returns:
+            WhisperEngine or CTranslate2Engine: The model on its engine
+        """
+        key = model_key(name, engine)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            model = self._load(key)
+            self._models[key] = model
+            self._sizes[key] = model.memory_bytes()
+            self._evict(keep=key)
+            return model
+
+    def preload(self, keys=None):
+        """
+        Load and warm up models before any job needs them.
+
+        Args:
+            keys (list, optional): "engine:model" keys. Defaults to get_preload_model_names().
+        """
+        for key in keys or get_preload_model_names():
+            engine, _, name = key.partition(":")
+            self.get(name, engine)
+
+    def _load(self, key):
+        engine_name, _, name = key.partition(":")
+        print(f"Loading Whisper model: {name} on {engine_name}")
+        started = time.monotonic()
+        model = load_engine(engine_name, name, self.cpu_threads)
+        loaded = time.monotonic()
+        model.transcribe(_warmup_clip())
+        print(
+            f"Model {key} loaded in {loaded - started:.1f}s, "
+            f"warmed up in {time.monotonic() - loaded:.1f}s"
+        )
+        return model
+
+    def _evict(self, keep):
+        if self.memory_budget <= 0:
+            return
+        while self.memory_used > self.memory_budget and len(self._models) > 1:
+            key = next(iter(self._models))
+            if key == keep:
+                break
+            del self._models[key]
+            size = self._sizes.pop(key)
+            print(f"Evicted Whisper model {key} ({size / 1024 / 1024:.0f} MB)")
+
+
+registry = ModelRegistry()
@@ -0,0 +1,111 @@
+import json
+import os
+import time
+
+from sqlalchemy import cast, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from db.models.summary import Summary
+from db.session import get_db
+from .events import publish_job_event
+
+# Postgres NOTIFY payloads are limited to 8000 bytes, leave room for the envelope
+MAX_EVENT_BYTES = 6000
+
+
+def segment_events(segments, max_bytes=MAX_EVENT_BYTES):
+    """
+    Pack segments into as few "segment" events as fit under max_bytes each.
+
+    Args:
+        segments (list): Partial segments, in order
+        max_bytes (int): Largest serialized size of the segments of one event
+
+    Returns:
+        list: Event payloads
+    """
+    events = []
+    batch = []
+    size = 0
+    for segment in segments:
+        segment_size = len(json.dumps(segment)) + 2
+        if batch and size + segment_size > max_bytes:
+            events.append({"event": "segment", "segments": batch})
+            batch = []
+            size = 0
+        batch.append(segment)
+        size += segment_size
+    if batch:
+        events.append({"event": "segment", "segments": batch})
+    return events
+
+
+class PartialTranscript:
+    """
+    Collects transcript segments while a job is being transcribed and forwards
+    them to the job's event stream. Segments are buffered and flushed at most
+    once per STREAM_FLUSH_INTERVAL seconds: one row update and a few events per
+    flush, never one per segment.
+    """
+
+    def __init__(self, job_id, flush_interval=None):
+        """
+        Args:
+            job_id (str): Job identifier
+            flush_interval (float, optional): Seconds between flushes.
+                Defaults to STREAM_FLUSH_INTERVAL.
+        """
+        if flush_interval is None:
+            flush_interval = float(os.getenv("STREAM_FLUSH_INTERVAL", "2"))
+        self.job_id = job_id
+        self.flush_interval = flush_interval
+        self.segments = []
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def add(self, segments):
+        """
+        Append newly decoded segments, flushing if the interval has elapsed.
+
+        Args:
+            segments (list): Segments with start, end and text, in the original timeline
+        """
+        for segment in segments:
+            segment = dict(segment, index=len(self.segments))
+            self.segments.append(segment)
+            self._pending.append(segment)
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Store the new segments and publish them. On Postgres they are appended to
+        the stored list, so a flush costs the same at the end of a long recording
+        as at its start.
+        """
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+        db = next(get_db())
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                stored = func.coalesce(Summary.partial_segments, cast("[]", JSONB))
+                segments = stored.op("||")(cast(json.dumps(pending), JSONB))
+            else:
+                segments = list(self.segments)
+            db.query(Summary).filter(Summary.job_id == self.job_id).update(
+                {"partial_segments": segments}, synchronize_session=False
+            )
+            for payload in segment_events(pending):
+                publish_job_event(db, self.job_id, payload)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Appends must not leave gaps, retry these with the next flush
+            self._pending = pending + self._pending
+            print(f"Failed to stream partial transcript for job {self.job_id}: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,175 @@
+import os
+import time
+from datetime import datetime, timezone
+
+from db.models.summary import Summary
+from db.session import get_db
+from .events import job_status_payload, publish_job_event
+
+STAGE_LABELS = {
+    "decoding": "Decoding audio",
+    "vad": "Detecting speech",
+    "transcribing": "Transcribing",
+    "summarizing": "Summarizing",
+    "posting_to_slack": "Posting to Slack",
+}
+
+# Realtime factor (processing seconds per audio second) of the last transcriptions
+# in this process, used for an ETA before the current job reports any progress
+_observed_rtf = None
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobProgress:
+    """
+    Tracks the stage and percentage of a running job and reports it over the job
+    event stream. Stage changes are stored on the Summary row; percentage updates
+    are only published, at most once per PROGRESS_INTERVAL seconds, so a long
+    transcription never costs a database write per segment.
+    """
+
+    def __init__(self, job_id, min_interval=None):
+        """
+        Args:
+            job_id (str): Job identifier
+            min_interval (float, optional): Seconds between percentage updates.
+                Defaults to PROGRESS_INTERVAL.
+        """
+        if min_interval is None:
+            min_interval = float(os.getenv("PROGRESS_INTERVAL", "1"))
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.stages = []
+        self.percent = None
+        self.audio_seconds = None
+        self._stage_started = None
+        self._done_seconds = 0.0
+        self._last_publish = 0.0
+
+    @property
+    def current_stage(self):
+        return self.stages[-1]["name"] if self.stages else None
+
+    def stage(self, name, **details):
+        """
+        Enter a new stage, store it and publish it immediately.
+
+        Args:
+            name (str): Stage name, one of STAGE_LABELS
+            **details: Extra information attached to the stage
+        """
+        self._leave_stage()
+        self.stages.append({"name": name, "started_at": _now_iso(), **details})
+        self._stage_started = time.monotonic()
+        self.percent = None
+        if name == "transcribing":
+            self.audio_seconds = details.get("audio_seconds", self.audio_seconds)
+            self.percent = 0.0
+            self._done_seconds = 0.0
+        self._publish(persist=True)
+
+    def advance(self, done_seconds, total_seconds):
+        """
+        Report how much of the audio has been transcribed.
+
+        Args:
+            done_seconds (float): Seconds of the recording covered so far
+            total_seconds (float): Length of the recording in seconds
+        """
+        self.audio_seconds = total_seconds
+        self._done_seconds = done_seconds
+        self.percent = round(100.0 * min(1.0, done_seconds / max(total_seconds, 1e-6)), 1)
+        if time.monotonic() - self._last_publish >= self.min_interval:
+            self._publish(persist=False)
+
+    def finish(self):
+        """
+        Close the last stage. The final snapshot is stored with the job result.
+
+        Returns:
+            dict: The final progress snapshot
+        """
+        self._leave_stage()
+        return self.snapshot()
+
+    def eta_seconds(self):
+        """
+        Estimate the time left in the transcription stage from the observed realtime factor.
+
+        Returns:
+            float: Seconds left, or None if there is nothing to go on yet
+        """
+        if self.current_stage not in ("decoding", "vad", "transcribing"):
+            return None
+        if not self.audio_seconds:
+            return None
+
+        remaining = self.audio_seconds - self._done_seconds
+        if self.current_stage == "transcribing" and self._done_seconds > 0:
+            rtf = (time.monotonic() - self._stage_started) / self._done_seconds
+        elif _observed_rtf is not None:
+            rtf = _observed_rtf
+        else:
+            return None
+        return round(max(0.0, remaining * rtf), 1)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Current stage, percentage, ETA and stage history
+        """
+        return {
+            "message": self.describe(),
+            "stage": self.current_stage,
+            "percent": self.percent,
+            "eta_seconds": self.eta_seconds(),
+            "stages": self.stages,
+        }
+
+    def describe(self):
+        """
+        Returns:
+            str: Human readable status, e.g. "Transcribing (42%, about 3 min left)"
+        """
+        label = STAGE_LABELS.get(self.current_stage, "Processing")
+        details = []
+        if self.percent is not None:
+            details.append(f"{self.percent:.0f}%")
+        eta = self.eta_seconds()
+        if eta is not None:
+            details.append(
+                f"about {eta / 60:.0f} min left" if eta >= 90 else f"about {eta:.0f}s left"
+            )
+        return f"{label} ({', '.join(details)})" if details else label
+
+    def _leave_stage(self):
+        global _observed_rtf
+
+        if not self.stages or "finished_at" in self.stages[-1]:
+            return
+        self.stages[-1]["finished_at"] = _now_iso()
+        if self.current_stage == "transcribing" and self._done_seconds > 0:
+            rtf = (time.monotonic() - self._stage_started) / self._done_seconds
+            _observed_rtf = rtf if _observed_rtf is None else 0.7 * _observed_rtf + 0.3 * rtf
+
+    def _publish(self, persist):
+        self._last_publish = time.monotonic()
+        snapshot = self.snapshot()
+        db = next(get_db())
+        try:
+            if persist:
+                db.query(Summary).filter(Summary.job_id == self.job_id).update(
+                    {"progress": snapshot}, synchronize_session=False
+                )
+            publish_job_event(
+                db, self.job_id, job_status_payload("processing", progress=snapshot)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to report progress for job {self.job_id}: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,85 @@
+from sqlalchemy.dialects.postgresql import insert
+
+from db.models.resource_version import ResourceVersion
+
+PROJECTS = "projects"
+CHANNELS = "channels"
+SUMMARIES = "summaries"
+
+
+def channel_key(channel_id):
+    """
+    Returns:
+        str: Version key of a channel and its summaries
+    """
+    return f"channel:{channel_id}"
+
+
+def summary_keys(channel_id):
+    """
+    Returns:
+        list: Version keys changed by creating, deleting or changing the status
+            of a summary of the channel
+    """
+    return [SUMMARIES, channel_key(channel_id)]
+
+
+def bump_versions(db, keys):
+    """
+    Increment the version of each key in the caller's transaction, so cached
+    responses depending on them are invalidated exactly when the change commits.
+    The rows stay locked until then: call this right before committing.
+
+    Args:
+        db: Database session holding the change
+        keys (iterable): Version keys, see channel_key and summary_keys
+    """
+    # Sorted, so concurrent transactions lock the rows in the same order
+    keys = sorted(set(keys))
+    if not keys:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        statement = insert(ResourceVersion).values(
+            [{"key": key, "version": 1} for key in keys]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ResourceVersion.key],
+                set_={"version": ResourceVersion.version + 1},
+            )
+        )
+        return
+
+    for key in keys:
+        updated = (
+            db.query(ResourceVersion)
+            .filter(ResourceVersion.key == key)
+            .update(
+                {"version": ResourceVersion.version + 1}, synchronize_session=False
+            )
+        )
+        if not updated:
+            db.add(ResourceVersion(key=key, version=1))
+    db.flush()
+
+
+def read_versions(db, keys):
+    """
+    Current version of each key, in one primary key lookup.
+
+    Args:
+        db: Database session
+        keys (list): Version keys
+
+    Returns:
+        dict: Version per key, 0 for keys never bumped
+    """
+    rows = (
+        db.query(ResourceVersion.key, ResourceVersion.version)
+        .filter(ResourceVersion.key.in_(keys))
+        .all()
+    )
+    versions = dict.fromkeys(keys, 0)
+    versions.update(rows)
+    return versions
@@ -0,0 +1,300 @@
+import os
+import re
+
+from sqlalchemy import cast, func, select
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
+from sqlalchemy.orm import undefer
+
+from db.models.channel import Channel
+from db.models.search import SearchDocument
+from db.models.summary import Summary
+from .transcript_store import load_transcript_texts
+
+SNIPPET_CHARS = 240
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+
+def get_search_language():
+    return os.getenv("SEARCH_LANGUAGE", "english")
+
+
+def _uses_postgres(db):
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _weighted_vector(summary_text, transcript_text, language):
+    config = cast(language, REGCONFIG)
+    return func.setweight(
+        func.to_tsvector(config, summary_text or ""), "A"
+    ).op("||")(func.setweight(func.to_tsvector(config, transcript_text or ""), "B"))
+
+
+def index_summary(db, summary_id, channel_id, created_at, summary_text, transcript_text):
+    """
+    Add or refresh the search document of a completed summary. Runs in the
+    caller's transaction, so the index changes together with the row.
+    Without Postgres there is nothing to maintain: search_summaries scans instead.
+
+    Args:
+        db: Database session
+        summary_id (int): ID of the Summary row
+        channel_id (int): Channel of the summary, for filtering
+        created_at (datetime): Creation time of the summary, for filtering
+        summary_text (str): Summary text, ranked above the transcript
+        transcript_text (str): Transcript text
+    """
+    if not _uses_postgres(db):
+        return
+
+    vector = _weighted_vector(summary_text, transcript_text, get_search_language())
+    statement = insert(SearchDocument).values(
+        summary_id=summary_id,
+        channel_id=channel_id,
+        created_at=created_at,
+        search_vector=vector,
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[SearchDocument.summary_id],
+            set_={
+                "channel_id": statement.excluded.channel_id,
+                "created_at": statement.excluded.created_at,
+                "search_vector": statement.excluded.search_vector,
+            },
+        )
+    )
+
+
+def query_terms(query):
+    """
+    Returns:
+        list: Lowercased words of a search query, without operators
+    """
+    return [
+        term
+        for term in re.findall(r"\w+", query.lower())
+        if term not in ("or", "and", "not")
+    ]
+
+
+def highlight(text, terms, max_chars=SNIPPET_CHARS):
+    """
+    Cut a snippet of text around the first match of any term and mark every match.
+    Terms match as substrings, like the scan that found the summary; Postgres
+    builds its snippets with ts_headline instead.
+
+    Args:
+        text (str): Text to take the snippet from
+        terms (list): Lowercased query terms
+        max_chars (int): Approximate snippet length
+
+    Returns:
+        str: Snippet with matches wrapped in <mark> tags, or None if nothing matches
+    """
+    if not text or not terms:
+        return None
+    ordered = sorted(set(terms), key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(term) for term in ordered), re.I)
+    first = pattern.search(text)
+    if first is None:
+        return None
+
+    start = max(0, first.start() - max_chars // 3)
+    end = min(len(text), start + max_chars)
+    if start > 0:
+        start = text.find(" ", start) + 1 or start
+    snippet = pattern.sub(
+        lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}", text[start:end]
+    )
+    return ("…" if start > 0 else "") + snippet.strip() + ("…" if end < len(text) else "")
+
+
+def _filtered(query, channel_id, project_id, since, until, model):
+    if channel_id is not None:
+        query = query.filter(model.channel_id == channel_id)
+    if project_id is not None:
+        query = query.filter(
+            model.channel_id.in_(select(Channel.id).where(Channel.project_id == project_id))
+        )
+    if since is not None:
+        query = query.filter(model.created_at >= since)
+    if until is not None:
+        query = query.filter(model.created_at < until)
+    return query
+
+
+def _marked(snippet):
+    # ts_headline returns the start of the text when nothing in it matches
+    return snippet if snippet and HIGHLIGHT_START in snippet else None
+
+
+def get_transcript_snippet_count():
+    return int(os.getenv("SEARCH_TRANSCRIPT_SNIPPETS", "5"))
+
+
+def _search_postgres(db, query, filters, limit):
+    config = cast(get_search_language(), REGCONFIG)
+    tsquery = func.websearch_to_tsquery(config, query)
+    rank = func.ts_rank_cd(SearchDocument.search_vector, tsquery).label("rank")
+    page = (
+        _filtered(
+            db.query(SearchDocument.summary_id, SearchDocument.created_at, rank),
+            model=SearchDocument,
+            **filters,
+        )
+        .filter(SearchDocument.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), SearchDocument.created_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    # Summary headlines are computed outside the ranked subquery, so only for the page
+    rows = (
+        db.query(
+            page.c.summary_id,
+            page.c.rank,
+            func.ts_headline(config, func.coalesce(Summary.summary, ""), tsquery, HEADLINE_OPTIONS),
+            Summary.transcript_ref,
+        )
+        .select_from(page)
+        .join(Summary, Summary.id == page.c.summary_id)
+        .order_by(page.c.rank.desc(), page.c.created_at.desc())
+        .all()
+    )
+
+    # Transcripts are only decompressed for the first few results
+    refs = [row[3] for row in rows[: get_transcript_snippet_count()] if row[3]]
+    texts = load_transcript_texts(db, refs)
+    headlines = {}
+    if texts:
+        ordered = list(texts)
+        values = db.execute(
+            select(
+                *[
+                    func.ts_headline(config, texts[ref], tsquery, HEADLINE_OPTIONS)
+                    for ref in ordered
+                ]
+            )
+        ).one()
+        headlines = dict(zip(ordered, values))
+
+    return [
+        (
+            summary_id,
+            float(score),
+            _marked(summary_snippet),
+            _marked(headlines.get(transcript_ref)),
+        )
+        for summary_id, score, summary_snippet, transcript_ref in rows
+    ]
+
+
+def _search_scan(db, terms, filters, limit, batch_size=500):
+    """
+    Fallback for databases without full-text search: scans every completed
+    summary and its transcript. Meant for tests and small local setups.
+    """
+    scored = []
+    summaries = _filtered(
+        db.query(Summary).options(undefer(Summary.summary)),
+        model=Summary,
+        **filters,
+    ).filter(Summary.status == "completed")
+    batch = []
+    for summary in summaries.yield_per(batch_size):
+        batch.append(summary)
+        if len(batch) == batch_size:
+            scored.extend(_score_batch(db, batch, terms))
+            batch = []
+    scored.extend(_score_batch(db, batch, terms))
+    scored.sort(key=lambda result: result[1], reverse=True)
+    return scored[:limit]
+
+
+def _score_batch(db, summaries, terms):
+    transcripts = load_transcript_texts(db, [summary.transcript_ref for summary in summaries])
+    results = []
+    for summary in summaries:
+        transcript = transcripts.get(summary.transcript_ref, "")
+        summary_text = (summary.summary or "").lower()
+        transcript_text = transcript.lower()
+        if not all(term in summary_text or term in transcript_text for term in terms):
+            continue
+        score = sum(
+            2 * summary_text.count(term) + transcript_text.count(term) for term in terms
+        )
+        results.append(
+            (
+                summary.id,
+                float(score),
+                highlight(summary.summary, terms),
+                highlight(transcript, terms),
+            )
+        )
+    return results
+
+
+def search_summaries(
+    db, query, channel_id=None, project_id=None, since=None, until=None, limit=20
+):
+    """
+    Find the summaries whose summary or transcript matches a query, best first.
+    On Postgres this is one GIN index lookup ranked with ts_rank_cd; the query
+    accepts web search syntax ("quoted phrases", -excluded, or). The same query
+    builds the summary snippets with ts_headline, for the returned page only;
+    transcript snippets are only built for the first SEARCH_TRANSCRIPT_SNIPPETS
+    results, the others have none.
+
+    Args:
+        db: Database session
+        query (str): Search query
+        channel_id (int, optional): Only this channel
+        project_id (int, optional): Only the channels of this project
+        since (datetime, optional): Only summaries created at or after this time
+        until (datetime, optional): Only summaries created before this time
+        limit (int): Maximum number of results
+
+    Returns:
+        list: Dicts with the Summary row, rank, and highlighted summary and transcript snippets
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    filters = {
+        "channel_id": channel_id,
+        "project_id": project_id,
+        "since": since,
+        "until": until,
+    }
+    if _uses_postgres(db):
+        ranked = _search_postgres(db, query, filters, limit)
+    else:
+        ranked = _search_scan(db, terms, filters, limit)
+    if not ranked:
+        return []
+
+    summaries = {
+        summary.id: summary
+        for summary in db.query(Summary)
+        .options(undefer(Summary.summary))
+        .filter(Summary.id.in_([result[0] for result in ranked]))
+    }
+    results = []
+    for summary_id, rank, summary_snippet, transcript_snippet in ranked:
+        summary = summaries.get(summary_id)
+        if summary is None:
+            continue
+        results.append(
+            {
+                "summary": summary,
+                "rank": rank,
+                "summary_snippet": summary_snippet,
+                "transcript_snippet": transcript_snippet,
+            }
+        )
+    return results
@@ -0,0 +1,115 @@
+import fcntl
+import json
+import os
+from dataclasses import asdict
+
+
+def shared_weights_enabled():
+    return os.getenv("WHISPER_SHARED_WEIGHTS", "true").lower() == "true"
+
+
+def get_weights_dir():
+    return os.getenv(
+        "WHISPER_WEIGHTS_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "whisper", "safetensors"),
+    )
+
+
+def weights_path(model_name):
+    return os.path.join(get_weights_dir(), f"{model_name}.fp32.safetensors")
+
+
+def export_whisper_weights(model_name):
+    """
+    Convert a Whisper checkpoint to a float32 safetensors file, once per host.
+    Processes starting together wait on a lock file, so only one converts.
+
+    Args:
+        model_name (str): Whisper model - tiny, base, small, medium, or large
+
+    Returns:
+        str: Path of the safetensors file
+    """
+    path = weights_path(model_name)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not os.path.exists(path):
+            import whisper
+            from safetensors.torch import save_file
+
+            print(f"Exporting Whisper model {model_name} to {path}")
+            # Checkpoints are float16, CPU inference runs on the float32 copy
+            model = whisper.load_model(model_name, device="cpu")
+            state = {
+                name: tensor.detach().contiguous()
+                for name, tensor in model.state_dict().items()
+            }
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            save_file(
+                state,
+                temp_path,
+                metadata={"model": model_name, "dims": json.dumps(asdict(model.dims))},
+            )
+            os.replace(temp_path, path)
+    return path
+
+
+def load_whisper_shared(model_name):
+    """
+    Load a Whisper model whose weights are memory-mapped, read-only, from its
+    safetensors file. Every process loading the same model maps the same page
+    cache pages, so the weights are in memory once per host rather than once per
+    process; each process only pays for its activations.
+
+    Args:
+        model_name (str): Whisper model - tiny, base, small, medium, or large
+
+    Returns:
+        whisper.model.Whisper: The model on CPU
+    """
+    import whisper
+    from safetensors import safe_open
+    from safetensors.torch import load_file
+    from whisper.model import ModelDimensions, Whisper
+
+    path = export_whisper_weights(model_name)
+    with safe_open(path, framework="pt") as f:
+        dims = json.loads(f.metadata()["dims"])
+
+    model = Whisper(ModelDimensions(**dims))
+    # assign keeps the mapped tensors instead of copying them into the
+    # freshly allocated parameters, which are freed
+    model.load_state_dict(load_file(path), assign=True)
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(model_name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model
+
+
+def process_memory(pid="self"):
+    """
+    Memory of a process, from /proc/<pid>/smaps_rollup (Linux only).
+
+    Args:
+        pid (int or str, optional): Process id. Defaults to the current process.
+
+    Returns:
+        dict: rss, pss (shared pages split between the processes mapping them),
+            private and anonymous (heap, not backed by a file) in bytes
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "anonymous": fields.get("Anonymous", 0),
+    }
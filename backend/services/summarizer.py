@@ -1,7 +1,59 @@
+import asyncio
 import os
+import re
 from datetime import datetime
 from pathlib import Path
-from anthropic import Anthropic
+from .anthropic_client import get_summarization_client
+from .cache import hash_text, summary_cache_key
+
+SUMMARY_MODEL = "claude-3-5-sonnet-20240620"
+# Bump whenever the prompt or generation parameters change, to invalidate cached summaries
+PROMPT_VERSION = "standup-v1"
+SYSTEM_PROMPT = "You are a helpful assistant that specializes in summarizing standup meetings in a concise and actionable format."
+# Rough English average, good enough to decide when a transcript needs chunking
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_transcript(transcript_text, segments=None, max_tokens=6000):
+    """
+    Split a transcript into chunks of at most max_tokens, on segment boundaries.
+
+    Args:
+        transcript_text (str): The full transcript
+        segments (list, optional): Whisper segments. If None, lines and sentences are used.
+        max_tokens (int): Token budget of a chunk
+
+    Returns:
+        list: Chunk texts, in order
+    """
+    if segments:
+        pieces = [segment["text"].strip() for segment in segments]
+    else:
+        pieces = [
+            sentence.strip()
+            for line in transcript_text.splitlines()
+            for sentence in re.split(r"(?<=[.!?])\s+", line)
+        ]
+    pieces = [piece for piece in pieces if piece]
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
 
 
 class Summarizer:
@@ -24,15 +76,21 @@ class Summarizer:
                 "Anthropic API key is required. Set it in the .env file or pass it directly."
             )
 
-        self.client = Anthropic(api_key=api_key)
+        self.client = get_summarization_client(api_key)
 
-    def summarize(self, transcript_text, output_file=None):
+    def summarize(self, transcript_text, output_file=None, segments=None, cache=None):
         """
         Summarize a transcript using Anthropic's Claude.
+        Transcripts longer than SUMMARY_CHUNK_TOKENS are summarized with map-reduce:
+        chunks split on segment boundaries are summarized concurrently, then merged.
 
         Args:
             transcript_text (str): The transcript text to summarize
             output_file (str, optional): Path to save the summary
+            segments (list, optional): Whisper segments, used to choose chunk boundaries
+            cache (optional): Object with get(key) and set(key, chunk_hash, summary) for
+                chunk summaries, chunk_hash being the SHA-256 of the chunk text, so a
+                retry only redoes the chunks that failed. See cache.SummaryCacheStore.
 
         Returns:
             str: The summarized text
@@ -42,32 +100,15 @@ class Summarizer:
 
         print("Generating summary with Anthropic's Claude")
 
-        prompt = f"""
-        You are a helpful assistant that summarizes standup meetings. Below is a transcript of a standup meeting.
-        Please provide a concise summary that includes:
-        
-        1. Key updates from each participant
-        2. Any blockers or issues mentioned
-        3. Action items or next steps
-        4. Decisions made during the meeting
-        
-        Format the summary in a clear, organized way that would be useful for team members who missed the meeting.
-        
-        Here is the transcript:
-        
-        {transcript_text}
-        """
+        max_chunk_tokens = int(os.getenv("SUMMARY_CHUNK_TOKENS", "6000"))
 
         try:
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=1024,
-                temperature=0.3,
-                system="You are a helpful assistant that specializes in summarizing standup meetings in a concise and actionable format.",
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            summary = response.content[0].text
+            if estimate_tokens(transcript_text) <= max_chunk_tokens:
+                summary = self._summarize_single(transcript_text)
+            else:
+                summary = self._summarize_map_reduce(
+                    transcript_text, segments, max_chunk_tokens, cache
+                )
 
             if output_file is None:
                 if os.path.exists(transcript_text):
@@ -93,3 +134,106 @@ class Summarizer:
         except Exception as e:
             print(f"Error generating summary: {str(e)}")
             raise
+
+    def _complete(self, prompt, max_tokens=1024):
+        return self.client.run(self._acomplete(prompt, max_tokens))
+
+    async def _acomplete(self, prompt, max_tokens=1024):
+        response = await self.client.create_message(
+            model=SUMMARY_MODEL,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            system=SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return response.content[0].text
+
+    def _summarize_single(self, transcript_text):
+        prompt = f"""
+        You are a helpful assistant that summarizes standup meetings. Below is a transcript of a standup meeting.
+        Please provide a concise summary that includes:
+        
+        1. Key updates from each participant
+        2. Any blockers or issues mentioned
+        3. Action items or next steps
+        4. Decisions made during the meeting
+        
+        Format the summary in a clear, organized way that would be useful for team members who missed the meeting.
+        
+        Here is the transcript:
+        
+        {transcript_text}
+        """
+        return self._complete(prompt)
+
+    async def _summarize_chunk(self, chunk_text, index, total):
+        prompt = f"""
+        Below is part {index + 1} of {total} of a standup meeting transcript.
+        Extract, as terse bullet points:
+        
+        1. Updates, attributed to the participant who gave them
+        2. Blockers or issues
+        3. Action items or next steps
+        4. Decisions
+        
+        Only use information from this part. Skip any category with nothing to report.
+        
+        Here is the transcript part:
+        
+        {chunk_text}
+        """
+        return await self._acomplete(prompt, max_tokens=512)
+
+    def _summarize_map_reduce(self, transcript_text, segments, max_chunk_tokens, cache):
+        chunks = split_transcript(transcript_text, segments, max_chunk_tokens)
+        print(f"Transcript is long, summarizing {len(chunks)} chunks concurrently")
+
+        chunk_hashes = [hash_text(chunk) for chunk in chunks]
+        keys = [
+            summary_cache_key(chunk_hash, f"{PROMPT_VERSION}:map", SUMMARY_MODEL)
+            for chunk_hash in chunk_hashes
+        ]
+        partials = [cache.get(key) if cache is not None else None for key in keys]
+        missing = [i for i, partial in enumerate(partials) if partial is None]
+
+        if missing:
+            results = self.client.run(self._summarize_chunks(chunks, missing))
+            errors = []
+            for i, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                    continue
+                partials[i] = result
+                if cache is not None:
+                    cache.set(keys[i], chunk_hashes[i], result)
+            if errors:
+                print(f"{len(errors)} of {len(chunks)} chunk summaries failed")
+                raise errors[0]
+
+        notes = "\n\n".join(
+            f"Part {i + 1}:\n{partial}" for i, partial in enumerate(partials)
+        )
+        prompt = f"""
+        You are a helpful assistant that summarizes standup meetings. Below are notes taken
+        on consecutive parts of a long standup meeting.
+        Please merge them into one concise summary that includes:
+        
+        1. Key updates from each participant
+        2. Any blockers or issues mentioned
+        3. Action items or next steps
+        4. Decisions made during the meeting
+        
+        Format the summary in a clear, organized way that would be useful for team members who missed the meeting.
+        
+        Here are the notes:
+        
+        {notes}
+        """
+        return self._complete(prompt)
+
+    async def _summarize_chunks(self, chunks, indexes):
+        # The shared client's semaphore bounds how many of these run at once
+        return await asyncio.gather(
+            *(self._summarize_chunk(chunks[i], i, len(chunks)) for i in indexes),
+            return_exceptions=True,
+        )
@@ -2,8 +2,25 @@ import os
 from db.models.channel import Channel
 from db.session import get_db
 from db.models.summary import Summary
-from .transcriber import Transcriber
-from .summarizer import Summarizer
+from .summarizer import PROMPT_VERSION, SUMMARY_MODEL, Summarizer
+from .audio_io import decode_audio, probe_duration, stream_audio
+from .events import job_status_payload, publish_job_event
+from .job_queue import LeaseLostError
+from .progress import JobProgress
+from .partial_transcript import PartialTranscript
+from .transcript_store import store_transcript_blob
+from .search import index_summary
+from .resource_versions import bump_versions, summary_keys
+from .cache import (
+    SummaryCacheStore,
+    get_cached_summary,
+    get_cached_transcript,
+    hash_text,
+    store_summary,
+    store_transcript,
+    summary_cache_key,
+    transcript_cache_key,
+)
 
 
 def send_to_slack(summary, channel_id=None):
@@ -63,69 +80,400 @@ def send_to_slack(summary, channel_id=None):
     finally:
         db.close()
 
+
+def _check_lease(job_id, lease_lost):
+    if lease_lost is not None and lease_lost.is_set():
+        raise LeaseLostError(f"Lease on job {job_id} was lost")
+
+
+def _claim_slack_post(db, job_id, job_filter):
+    """
+    Mark the summary as posted before posting it, with the lease-guarded update,
+    so a worker reclaiming the job later never posts it a second time.
+
+    Returns:
+        bool: True if this worker should post, False if an earlier attempt already did
+
+    Raises:
+        LeaseLostError: If the row is no longer ours
+    """
+    claimed = (
+        db.query(Summary)
+        .filter(*job_filter, Summary.slack_notification_sent.isnot(True))
+        .update({"slack_notification_sent": True}, synchronize_session=False)
+    )
+    db.commit()
+    if claimed == 1:
+        return True
+    if db.query(Summary.id).filter(*job_filter).first() is None:
+        raise LeaseLostError(f"Lease on job {job_id} was lost")
+    return False
+
+
+def _complete_job(
+    db,
+    job_id,
+    job_filter,
+    channel_id,
+    transcription,
+    send_to_slack_bool,
+    progress,
+    lease_lost=None,
+):
+    """
+    Summarize a finished transcription, post it to Slack and mark the job completed.
+
+    Args:
+        db: Database session
+        job_id: Job identifier of the Summary row
+        job_filter: Filters selecting the row, including the lease owner if any
+        channel_id: ID of the channel in our database
+        transcription: Whisper-style result with text and segments
+        send_to_slack_bool: Whether to post the summary to Slack
+        progress: JobProgress of the job
+        lease_lost: threading.Event set by the LeaseHeartbeat when the lease expired
+
+    Returns:
+        bool: False if the row was no longer ours to update
+
+    Raises:
+        LeaseLostError: If the lease was lost before summarizing or posting
+    """
+    transcript_hash = hash_text(transcription["text"])
+    summary_key = summary_cache_key(transcript_hash, PROMPT_VERSION, SUMMARY_MODEL)
+    summary_text = get_cached_summary(db, summary_key)
+    if summary_text is not None:
+        print(f"Job {job_id}: reusing cached summary")
+    else:
+        _check_lease(job_id, lease_lost)
+        progress.stage("summarizing")
+        summarizer = Summarizer()
+        summary_text = summarizer.summarize(
+            transcription["text"],
+            segments=transcription.get("segments"),
+            cache=SummaryCacheStore(db, f"{PROMPT_VERSION}:map", SUMMARY_MODEL),
+        )
+        store_summary(
+            db, summary_key, transcript_hash, PROMPT_VERSION, SUMMARY_MODEL, summary_text
+        )
+
+    # Initialize variables with default values
+    slack_success = False
+    slack_error = None
+    
+    # Only try to send to Slack if requested
+    if send_to_slack_bool:
+        _check_lease(job_id, lease_lost)
+        if _claim_slack_post(db, job_id, job_filter):
+            progress.stage("posting_to_slack")
+            slack_success = send_to_slack(summary_text, channel_id)
+            if not slack_success:
+                slack_error = "Failed to send to Slack (channel not found or other error)"
+        else:
+            print(f"Job {job_id}: summary already posted to Slack by an earlier attempt")
+            slack_success = True
+        
+    transcript_ref = store_transcript_blob(
+        db, transcription["text"], transcription.get("segments")
+    )
+    updated = db.query(Summary).filter(*job_filter).update(
+        {
+            "status": "completed",
+            "transcript_ref": transcript_ref,
+            "summary": summary_text,
+            "slack_notification_sent": slack_success,
+            "slack_error": slack_error,
+            "progress": progress.finish(),
+            "partial_segments": None,
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+    )
+    if updated == 1:
+        summary_id, created_at = (
+            db.query(Summary.id, Summary.created_at).filter(Summary.job_id == job_id).one()
+        )
+        index_summary(
+            db, summary_id, channel_id, created_at, summary_text, transcription["text"]
+        )
+        publish_job_event(
+            db,
+            job_id,
+            job_status_payload(
+                "completed",
+                summary_id=summary_id,
+                slack_notification_sent=slack_success,
+                slack_error=slack_error,
+            ),
+        )
+        bump_versions(db, summary_keys(channel_id))
+    db.commit()
+    if updated == 1:
+        print(f"✅ Updated database status to 'completed' for job {job_id}")
+    else:
+        print(f"Lease on job {job_id} was lost, discarding result")
+    return updated == 1
+
+
+def _fail_job(db, job_id, job_filter, error):
+    """
+    Mark the job failed and publish the failure.
+
+    Returns:
+        bool: False if the row was no longer ours to update
+    """
+    db.rollback()
+    updated = db.query(Summary).filter(*job_filter).update(
+        {
+            "status": "failed",
+            "slack_error": str(error),
+            "lease_owner": None,
+            "lease_expires_at": None,
+        }
+    )
+    if updated == 1:
+        publish_job_event(db, job_id, job_status_payload("failed", slack_error=str(error)))
+        channel_id = db.query(Summary.channel_id).filter(Summary.job_id == job_id).scalar()
+        bump_versions(db, summary_keys(channel_id))
+    db.commit()
+    return updated == 1
+
+
 def transcribe_summarize_api(
     audio_file_path: str, 
     channel_id: int, 
     original_filename: str, 
     job_id: str, 
-    send_to_slack_bool: bool  # Changed parameter name to be more descriptive
+    send_to_slack_bool: bool,  # Changed parameter name to be more descriptive
+    worker_id: str = None,
+    audio_hash: str = None,
+    lease_lost=None,
 ):
+    """
+    Run the full pipeline for a job claimed from the queue.
+
+    Args:
+        audio_file_path: Path of the uploaded recording
+        channel_id: ID of the channel in our database
+        original_filename: Name of the uploaded file
+        job_id: Job identifier of the Summary row
+        send_to_slack_bool: Whether to post the summary to Slack
+        worker_id: Lease owner; final writes are skipped if the lease moved to another worker
+        audio_hash: SHA-256 of the upload, used to reuse the transcript of an identical file
+        lease_lost: threading.Event set when the lease expired; the job is then
+            abandoned before summarizing or posting, the new owner finishes it
+    """
     db = next(get_db())
+    job_filter = [Summary.job_id == job_id]
+    if worker_id is not None:
+        job_filter.append(Summary.lease_owner == worker_id)
+    finished = False
+    progress = JobProgress(job_id)
     try:
         channel = db.query(Channel).get(channel_id)
         if not channel:
             raise ValueError(f"Channel {channel_id} not found")
 
         print(f"Starting processing for {original_filename}...")
-        db.query(Summary).filter(Summary.job_id == job_id).update(
-            {"status": "processing"}
-        )
-        db.commit()
 
-        transcriber = Transcriber()
-        transcription = transcriber.transcribe_file(audio_file_path)
+        # Imported here so the API process can finish live jobs without loading Whisper
+        from .transcriber import Transcriber
 
-        summarizer = Summarizer()
-        summary_text = summarizer.summarize(transcription["text"])
+        transcriber = Transcriber(
+            channel.whisper_model, engine=channel.transcription_engine
+        )
+        transcript_key = None
+        transcription = None
+        if audio_hash:
+            transcript_key = transcript_cache_key(
+                audio_hash, transcriber.model_name, transcriber.decode_options()
+            )
+            transcription = get_cached_transcript(db, transcript_key)
+            if transcription is not None:
+                print(f"Job {job_id}: reusing cached transcript for audio {audio_hash}")
 
-        # Initialize variables with default values
-        slack_success = False
-        slack_error = None
-        
-        # Only try to send to Slack if requested
-        if send_to_slack_bool:
-            slack_success = send_to_slack(summary_text, channel_id)
-            if not slack_success:
-                slack_error = "Failed to send to Slack (channel not found or other error)"
-            
-        db.query(Summary).filter(Summary.job_id == job_id).update(
-            {
-                "status": "completed",
-                "transcript": transcription["text"],
-                "summary": summary_text,
-                "slack_notification_sent": slack_success,
-                "slack_error": slack_error,
-            }
+        if transcription is None:
+            progress.stage("decoding")
+            partial = PartialTranscript(job_id)
+            duration = probe_duration(audio_file_path)
+            if transcriber.should_stream(duration):
+                # Long recordings are decoded window by window, memory stays flat
+                transcription = transcriber.transcribe_stream(
+                    stream_audio(audio_file_path),
+                    total_seconds=duration,
+                    progress=progress,
+                    on_segments=partial.add,
+                )
+            else:
+                audio = decode_audio(audio_file_path)
+                transcription = transcriber.transcribe_audio_array(
+                    audio, progress=progress, on_segments=partial.add
+                )
+                del audio
+            partial.flush()
+            if "vad" in transcription:
+                vad = transcription["vad"]
+                print(
+                    f"Job {job_id}: skipped {vad['skipped_seconds']}s of "
+                    f"{vad['total_seconds']}s as silence"
+                )
+            if transcript_key:
+                store_transcript(
+                    db, transcript_key, audio_hash, transcriber.model_name, transcription
+                )
+
+        finished = _complete_job(
+            db,
+            job_id,
+            job_filter,
+            channel_id,
+            transcription,
+            send_to_slack_bool,
+            progress,
+            lease_lost,
         )
-        db.commit()
-        print(f"✅ Updated database status to 'completed' for job {job_id}")
 
-    except Exception as e:
+    except LeaseLostError as e:
         db.rollback()
-        db.query(Summary).filter(Summary.job_id == job_id).update(
-            {"status": "failed", "slack_error": str(e)}
+        print(f"{e}, leaving the job to its new owner")
+    except Exception as e:
+        finished = _fail_job(db, job_id, job_filter, e)
+        raise
+    finally:
+        db.close()
+        if finished:
+            temp_dir = os.path.dirname(audio_file_path)
+            for filename in os.listdir(temp_dir):
+                if filename.startswith(job_id):
+                    file_path = os.path.join(temp_dir, filename)
+                    try:
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                    except Exception as e:
+                        print(f"Failed to delete temp file {file_path}: {str(e)}")
+
+
+def complete_live_job(
+    job_id: str, channel_id: int, transcription: dict, send_to_slack_bool: bool
+):
+    """
+    Summarize the transcript of a live recording once its stream has closed.
+
+    Args:
+        job_id: Job identifier of the Summary row created for the live session
+        channel_id: ID of the channel in our database
+        transcription: Whisper-style result assembled from the live windows
+        send_to_slack_bool: Whether to post the summary to Slack
+
+    Returns:
+        bool: Whether the job was marked completed
+    """
+    db = next(get_db())
+    job_filter = [Summary.job_id == job_id]
+    progress = JobProgress(job_id)
+    try:
+        return _complete_job(
+            db, job_id, job_filter, channel_id, transcription, send_to_slack_bool, progress
+        )
+    except Exception as e:
+        print(f"Live job {job_id} failed: {e}")
+        _fail_job(db, job_id, job_filter, e)
+        return False
+    finally:
+        db.close()
+
+
+def find_cached_results(db, channel_id, audio_hash):
+    """
+    Look up what an earlier upload of the same audio left in the caches, with
+    the transcription settings of the channel.
+
+    Args:
+        db: Database session
+        channel_id: ID of the channel in our database
+        audio_hash: SHA-256 of the upload
+
+    Returns:
+        dict: transcription and summary, each None when not cached, or None if
+            the transcript is not cached or the channel does not exist
+    """
+    # Only reads the settings, the model is not loaded
+    from .transcriber import Transcriber
+
+    channel = db.query(Channel).get(channel_id)
+    if not channel:
+        return None
+    transcriber = Transcriber(
+        channel.whisper_model, engine=channel.transcription_engine, load_model=False
+    )
+    transcription = get_cached_transcript(
+        db,
+        transcript_cache_key(audio_hash, transcriber.model_name, transcriber.decode_options()),
+    )
+    if transcription is None:
+        return None
+    summary_key = summary_cache_key(
+        hash_text(transcription["text"]), PROMPT_VERSION, SUMMARY_MODEL
+    )
+    return {
+        "transcription": transcription,
+        "summary": get_cached_summary(db, summary_key),
+    }
+
+
+def complete_cached_job(
+    job_id: str,
+    channel_id: int,
+    original_filename: str,
+    transcription: dict,
+    send_to_slack_bool: bool,
+    audio_hash: str,
+):
+    """
+    Create and finish the job of an upload whose transcript and summary are both
+    cached, in the calling process: no worker is involved, so it takes as long
+    as the Slack post.
+
+    Args:
+        job_id: Public job identifier
+        channel_id: ID of the channel in our database
+        original_filename: Name of the uploaded file
+        transcription: Cached Whisper-style result
+        send_to_slack_bool: Whether to post the summary to Slack
+        audio_hash: SHA-256 of the upload
+
+    Returns:
+        bool: Whether the job was marked completed
+    """
+    db = next(get_db())
+    job_filter = [Summary.job_id == job_id]
+    try:
+        db.add(
+            Summary(
+                job_id=job_id,
+                channel_id=channel_id,
+                original_filename=original_filename,
+                audio_hash=audio_hash,
+                send_to_slack=send_to_slack_bool,
+                slack_notification_sent=False,
+                status="processing",
+            )
         )
+        bump_versions(db, summary_keys(channel_id))
         db.commit()
-        raise
+        print(f"Job {job_id}: transcript and summary of audio {audio_hash} are cached")
+        return _complete_job(
+            db,
+            job_id,
+            job_filter,
+            channel_id,
+            transcription,
+            send_to_slack_bool,
+            JobProgress(job_id),
+        )
+    except Exception as e:
+        print(f"Cached job {job_id} failed: {e}")
+        _fail_job(db, job_id, job_filter, e)
+        return False
     finally:
         db.close()
-        temp_dir = os.path.dirname(audio_file_path)
-        base_name = os.path.basename(audio_file_path).split("_")[0]
-        for filename in os.listdir(temp_dir):
-            if filename.startswith(base_name):
-                file_path = os.path.join(temp_dir, filename)
-                try:
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                except Exception as e:
-                    print(f"Failed to delete temp file {file_path}: {str(e)}")
\ No newline at end of file
@@ -1,36 +1,128 @@
+import multiprocessing
 import os
-import whisper
+import resource
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
+
+from .audio_io import SAMPLE_RATE, decode_audio
+from .chunking import (
+    PROMPT_CHARS,
+    find_split_points,
+    find_window_cut,
+    split_audio,
+    stitch_results,
+)
+from .cpu_budget import apply_budget, cpu_count, share_cores
+from .engines import get_default_engine_name
+from .model_registry import get_default_model_name, registry
+from .vad import remap_result, remove_silence
+
+
+def _init_chunk_worker(engine_name, model_name, num_threads):
+    """
+    Load the model in a chunk worker and limit its intra-op threads, so that
+    the workers share the cores instead of oversubscribing them.
+    """
+    apply_budget(num_threads)
+    registry.cpu_threads = num_threads
+    registry.get(model_name, engine_name)
+
+
+def _transcribe_chunk(engine_name, model_name, audio_chunk):
+    return registry.get(model_name, engine_name).transcribe(audio_chunk)
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _segment_emitter(on_segments, to_original=None):
+    """
+    Wrap a segment callback so it receives copies of the segments with times
+    in the original recording, while Whisper keeps working on its own dicts.
+
+    Args:
+        on_segments (callable): Receives lists of {"start", "end", "text"} dicts
+        to_original (callable, optional): Maps a time in the transcribed audio
+            to the original recording
+
+    Returns:
+        callable: emit(segments, offset=0.0), or None if on_segments is None
+    """
+    if on_segments is None:
+        return None
+    if to_original is None:
+        to_original = float
+
+    def emit(segments, offset=0.0):
+        on_segments(
+            [
+                {
+                    "start": round(to_original(segment["start"] + offset), 2),
+                    "end": round(to_original(segment["end"] + offset), 2),
+                    "text": segment["text"].strip(),
+                }
+                for segment in segments
+            ]
+        )
+
+    return emit
+
 
 class Transcriber:
     """
     Class for transcribing audio to text using Whisper
     """
-    _model = None
+    _chunk_pool = None
     
-    def __init__(self, model_name="base"):
+    def __init__(self, model_name=None, chunk_workers=None, engine=None, load_model=True):
         """
         Initialize the transcriber with the specified Whisper model.
 
         Args:
-            model_name (str): The Whisper model to use - tiny, base, small, medium, or large
+            model_name (str, optional): The Whisper model to use - tiny, base, small,
+                medium, or large. Defaults to WHISPER_MODEL.
+            chunk_workers (int, optional): Processes used to transcribe long recordings
+                in parallel. Defaults to TRANSCRIBE_CHUNK_WORKERS, 1 disables chunking.
+            engine (str, optional): "whisper" for the PyTorch reference implementation,
+                "ctranslate2" for the int8 CPU engine. Defaults to TRANSCRIBE_ENGINE.
+            load_model (bool): Load the model now. Without it only the settings are
+                read, enough for decode_options in a process that never transcribes.
         """
-        self.model_name = model_name
-        if Transcriber._model is None:
-            print(f"Loading Whisper model: {self.model_name}")
-            Transcriber._model = whisper.load_model(self.model_name)
-            print("Model loaded successfully")
-        
-        self.model = Transcriber._model
+        self.model_name = model_name or get_default_model_name()
+        self.engine_name = engine or get_default_engine_name()
+        if chunk_workers is None:
+            chunk_workers = int(
+                os.getenv("TRANSCRIBE_CHUNK_WORKERS", str(min(4, cpu_count())))
+            )
+        self.chunk_workers = max(1, chunk_workers)
+        self.chunk_seconds = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "300"))
+        self.parallel_min_seconds = float(
+            os.getenv("TRANSCRIBE_PARALLEL_MIN_SECONDS", "600")
+        )
+        self.use_vad = os.getenv("TRANSCRIBE_VAD", "true").lower() == "true"
+        self.stream_min_seconds = float(
+            os.getenv("TRANSCRIBE_STREAM_MIN_SECONDS", "1800")
+        )
+        self.stream_window_seconds = float(
+            os.getenv("TRANSCRIBE_STREAM_WINDOW_SECONDS", "300")
+        )
+        self.engine = registry.get(self.model_name, self.engine_name) if load_model else None
 
-    def transcribe_file(self, audio_file_path, output_file=None):
+    def transcribe_file(self, audio_file_path, output_file=None, on_segments=None):
         """
         Transcribe an audio file to text.
 
         Args:
             audio_file_path (str): Path to the audio file
             output_file (str, optional): Path to save the transcript
+            on_segments (callable, optional): Receives the segments of each window
+                as soon as Whisper decodes it
 
         Returns:
             dict: The transcription result containing text and segments
@@ -39,7 +131,9 @@ class Transcriber:
             raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
 
         print(f"Transcribing file: {audio_file_path}")
-        result = self.model.transcribe(audio_file_path)
+        result = self._timed_transcribe(
+            decode_audio(audio_file_path), on_segments=on_segments
+        )
 
         if output_file is None:
             output_dir = os.path.dirname(audio_file_path)
@@ -65,20 +159,36 @@ class Transcriber:
         # print(f"Transcript saved to: {transcript_file}")
         return result
 
-    def transcribe_audio_array(self, audio_array, sample_rate=16000, output_file=None):
+    def transcribe_audio_array(
+        self,
+        audio_array,
+        sample_rate=16000,
+        output_file=None,
+        progress=None,
+        on_segments=None,
+    ):
         """
         Transcribe audio from a numpy array.
 
         Args:
-            audio_array (numpy.ndarray): Audio data
-            sample_rate (int): Sample rate of the audio data
+            audio_array (numpy.ndarray): Mono float32 audio data
+            sample_rate (int): Sample rate of the audio data, Whisper requires 16 kHz
             output_file (str, optional): Path to save the transcript
+            progress (JobProgress, optional): Receives the VAD and transcription stages
+                and the share of audio transcribed so far
+            on_segments (callable, optional): Receives the segments of each window
+                as soon as Whisper decodes it, with start, end and text only
 
         Returns:
             dict: The transcription result containing text and segments
         """
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(
+                f"Audio must be sampled at {SAMPLE_RATE} Hz, got {sample_rate} Hz"
+            )
+
         print("Transcribing audio array")
-        result = self.model.transcribe(audio_array, sr=sample_rate)
+        result = self._timed_transcribe(audio_array, progress, on_segments)
 
         if output_file:
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -89,3 +199,307 @@ class Transcriber:
             print(f"Transcript saved to: {output_file}")
 
         return result
+
+    def decode_options(self):
+        """
+        Options that change the transcript for a given model, used in cache keys.
+
+        Returns:
+            dict: The engine, VAD and chunking settings in effect
+        """
+        return {
+            "engine": self.engine_name,
+            "vad": self.use_vad,
+            "chunk_seconds": self.chunk_seconds if self.chunk_workers > 1 else None,
+            "parallel_min_seconds": (
+                self.parallel_min_seconds if self.chunk_workers > 1 else None
+            ),
+            "stream_min_seconds": self.stream_min_seconds,
+            "stream_window_seconds": self.stream_window_seconds,
+        }
+
+    def should_stream(self, duration):
+        """
+        Args:
+            duration (float): Length of the recording in seconds, None if unknown
+
+        Returns:
+            bool: Whether to decode and transcribe the recording window by window
+                rather than as a whole, see transcribe_stream
+        """
+        return duration is None or duration >= self.stream_min_seconds
+
+    def transcribe_stream(self, blocks, total_seconds=None, progress=None, on_segments=None):
+        """
+        Transcribe a recording window by window while it is being decoded, so that
+        memory use does not grow with its length. Windows of about
+        TRANSCRIBE_STREAM_WINDOW_SECONDS are cut at a pause near their end and
+        have their silences removed one at a time. With a single chunk worker,
+        each window is transcribed with the end of the previous window's text as
+        context. With several, windows are transcribed concurrently like the
+        chunks of transcribe_audio_array, at most chunk_workers at a time, and
+        decoding waits for a free worker.
+
+        Args:
+            blocks (iterable): Mono float32 arrays at 16 kHz, see audio_io.stream_audio
+            total_seconds (float, optional): Length of the recording, for progress
+            progress (JobProgress, optional): Receives the transcription stage and
+                the share of audio transcribed so far
+            on_segments (callable, optional): Receives the segments of each window
+                as soon as it is decoded, with start, end and text only
+
+        Returns:
+            dict: The stitched transcription result, timestamps relative to the recording
+        """
+        started = time.monotonic()
+        if progress is not None:
+            progress.stage("transcribing", audio_seconds=total_seconds)
+        report = None
+        if progress is not None and total_seconds:
+            report = lambda done: progress.advance(done, total_seconds)
+
+        windows = self._stream_windows(blocks)
+        if self.chunk_workers > 1:
+            results = self._transcribe_windows_parallel(windows, report, on_segments)
+        else:
+            results = self._transcribe_windows(windows, report, on_segments)
+
+        result = stitch_results([(start, window_result) for start, _, window_result in results])
+        audio_seconds = sum(samples for _, samples, _ in results) / SAMPLE_RATE
+        if self.use_vad:
+            speech_seconds = sum(
+                window_result["vad"]["speech_seconds"] for _, _, window_result in results
+            )
+            result["vad"] = {
+                "total_seconds": round(audio_seconds, 2),
+                "speech_seconds": round(speech_seconds, 2),
+                "skipped_seconds": round(audio_seconds - speech_seconds, 2),
+            }
+        elapsed = time.monotonic() - started
+        print(
+            f"Streamed {audio_seconds:.0f}s of audio as {len(results)} windows in "
+            f"{elapsed:.1f}s (RTF {elapsed / max(audio_seconds, 1e-6):.3f}, "
+            f"{cpu_count()} threads, peak RSS {_peak_rss_mb():.0f} MB)"
+        )
+        return result
+
+    def _stream_windows(self, blocks):
+        """
+        Regroup decoded blocks into windows cut at pauses. Only the window being
+        filled is held here, the audio before it is released as soon as its
+        window has been handed out.
+
+        Yields:
+            tuple: (start sample, window array)
+        """
+        window_samples = int(self.stream_window_seconds * SAMPLE_RATE)
+        search_seconds = min(5.0, self.stream_window_seconds / 4)
+        pending = np.zeros(0, dtype=np.float32)
+        offset = 0
+        for block in blocks:
+            pending = np.concatenate((pending, block))
+            while len(pending) >= window_samples:
+                cut = find_window_cut(pending[:window_samples], search_seconds)
+                yield offset, pending[:cut]
+                pending = pending[cut:].copy()
+                offset += cut
+        if len(pending) > 0:
+            yield offset, pending
+
+    def _window_speech(self, window):
+        """
+        Returns:
+            tuple: (audio to transcribe, SpeechMap back to the window or None without VAD)
+        """
+        if not self.use_vad:
+            return window, None
+        return remove_silence(window)
+
+    def _transcribe_windows(self, windows, report=None, on_segments=None):
+        """
+        Transcribe windows one after the other, each with the end of the previous
+        window's text as context.
+
+        Returns:
+            list: (start sample, window length, result relative to the window) tuples
+        """
+        results = []
+        prompt = None
+        for start, window in windows:
+            offset = start / SAMPLE_RATE
+            speech, speech_map = self._window_speech(window)
+            to_window = speech_map.to_original if speech_map is not None else float
+            to_recording = lambda seconds: offset + to_window(seconds)
+
+            result = {"text": "", "segments": [], "language": None}
+            if len(speech) > 0:
+                result = self.engine.transcribe(
+                    speech,
+                    initial_prompt=prompt,
+                    report=(lambda done: report(to_recording(done))) if report else None,
+                    emit=_segment_emitter(on_segments, to_recording),
+                )
+            if speech_map is not None:
+                result = remap_result(result, speech_map)
+            results.append((start, len(window), result))
+            if report is not None:
+                report(offset + len(window) / SAMPLE_RATE)
+            prompt = result["text"][-PROMPT_CHARS:].strip() or prompt
+        return results
+
+    def _transcribe_windows_parallel(self, windows, report=None, on_segments=None):
+        """
+        Transcribe windows on the chunk pool, at most chunk_workers at a time.
+        Results are collected in recording order, and the next window is only
+        decoded once a worker is free.
+
+        Returns:
+            list: (start sample, window length, result relative to the window) tuples
+        """
+        emit = _segment_emitter(on_segments)
+        pool = self._get_chunk_pool()
+        results = []
+        in_flight = deque()
+
+        def collect():
+            start, samples, speech_map, future = in_flight.popleft()
+            result = {"text": "", "segments": [], "language": None}
+            if future is not None:
+                result = future.result()
+            if speech_map is not None:
+                result = remap_result(result, speech_map)
+            results.append((start, samples, result))
+            if emit is not None:
+                emit(result["segments"], start / SAMPLE_RATE)
+            if report is not None:
+                report((start + samples) / SAMPLE_RATE)
+
+        for start, window in windows:
+            speech, speech_map = self._window_speech(window)
+            future = None
+            if len(speech) > 0:
+                future = pool.submit(
+                    _transcribe_chunk, self.engine_name, self.model_name, speech
+                )
+            in_flight.append((start, len(window), speech_map, future))
+            del window, speech
+            while len(in_flight) >= self.chunk_workers:
+                collect()
+        while in_flight:
+            collect()
+        return results
+
+    def _timed_transcribe(self, audio, progress=None, on_segments=None):
+        started = time.monotonic()
+        result = self._transcribe(audio, progress, on_segments)
+        elapsed = time.monotonic() - started
+        audio_seconds = len(audio) / SAMPLE_RATE
+        print(
+            f"Transcribed {audio_seconds:.0f}s of audio in {elapsed:.1f}s "
+            f"(RTF {elapsed / max(audio_seconds, 1e-6):.3f}, {cpu_count()} threads, "
+            f"peak RSS {_peak_rss_mb():.0f} MB)"
+        )
+        return result
+
+    def _transcribe(self, audio, progress=None, on_segments=None):
+        total_seconds = len(audio) / SAMPLE_RATE
+        if not self.use_vad:
+            report = None
+            if progress is not None:
+                progress.stage("transcribing", audio_seconds=total_seconds)
+                report = lambda done: progress.advance(done, total_seconds)
+            return self._transcribe_speech(
+                audio, report, _segment_emitter(on_segments)
+            )
+
+        if progress is not None:
+            progress.stage("vad")
+        speech, speech_map = remove_silence(audio)
+        print(
+            f"VAD kept {speech_map.speech_seconds:.0f}s of {speech_map.total_seconds:.0f}s, "
+            f"skipped {speech_map.skipped_seconds:.0f}s of silence"
+        )
+        if len(speech) == 0:
+            return remap_result({"text": "", "segments": [], "language": None}, speech_map)
+
+        report = None
+        if progress is not None:
+            progress.stage(
+                "transcribing",
+                audio_seconds=total_seconds,
+                skipped_seconds=round(speech_map.skipped_seconds, 2),
+            )
+            report = lambda done: progress.advance(
+                speech_map.to_original(done), total_seconds
+            )
+        emit = _segment_emitter(on_segments, speech_map.to_original)
+        return remap_result(self._transcribe_speech(speech, report, emit), speech_map)
+
+    def _transcribe_speech(self, audio, report=None, emit=None):
+        duration = len(audio) / SAMPLE_RATE
+        if self.chunk_workers > 1 and duration >= self.parallel_min_seconds:
+            return self._transcribe_parallel(audio, report, emit)
+        return self.engine.transcribe(audio, report=report, emit=emit)
+
+    def _transcribe_parallel(self, audio, report=None, emit=None):
+        """
+        Split long audio at silences and transcribe the chunks concurrently.
+        Every sample belongs to exactly one chunk and cuts fall in pauses, so no
+        word is dropped or transcribed twice.
+
+        Args:
+            audio (numpy.ndarray): Mono float32 samples at 16 kHz
+            report (callable, optional): Called with the seconds of audio transcribed so far
+            emit (callable, optional): Called with each chunk's segments and offset,
+                in recording order, as soon as the chunk and all before it are done
+
+        Returns:
+            dict: The stitched transcription result, timestamps relative to the full audio
+        """
+        chunks = split_audio(audio, find_split_points(audio, self.chunk_seconds))
+        print(
+            f"Transcribing {len(audio) / SAMPLE_RATE:.0f}s of audio as {len(chunks)} "
+            f"chunks on {self.chunk_workers} workers"
+        )
+        started = time.monotonic()
+
+        pool = self._get_chunk_pool()
+        futures = [
+            pool.submit(_transcribe_chunk, self.engine_name, self.model_name, chunk)
+            for _, chunk in chunks
+        ]
+        if report is not None or emit is not None:
+            durations = {
+                future: len(chunk) / SAMPLE_RATE
+                for future, (_, chunk) in zip(futures, chunks)
+            }
+            done_seconds = 0.0
+            next_chunk = 0
+            for future in as_completed(futures):
+                done_seconds += durations[future]
+                if report is not None:
+                    report(done_seconds)
+                while (
+                    emit is not None
+                    and next_chunk < len(futures)
+                    and futures[next_chunk].done()
+                ):
+                    start, _ = chunks[next_chunk]
+                    emit(futures[next_chunk].result()["segments"], start / SAMPLE_RATE)
+                    next_chunk += 1
+        results = [(start, future.result()) for (start, _), future in zip(chunks, futures)]
+
+        print(f"Parallel transcription took {time.monotonic() - started:.1f}s")
+        return stitch_results(results)
+
+    def _get_chunk_pool(self):
+        if Transcriber._chunk_pool is None:
+            # Within a transcription worker, this divides the worker's own share
+            threads = share_cores(self.chunk_workers)
+            Transcriber._chunk_pool = ProcessPoolExecutor(
+                max_workers=self.chunk_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(self.engine_name, self.model_name, threads),
+            )
+        return Transcriber._chunk_pool
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import zlib
+
+from sqlalchemy.exc import IntegrityError
+
+from db.models.transcript_blob import TranscriptBlob
+
+try:
+    import zstandard
+except ImportError:  # zlib is always available, zstd is smaller and faster to read
+    zstandard = None
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def _compress(payload):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return "zlib", zlib.compress(payload, ZLIB_LEVEL)
+
+
+def _decompress(codec, data):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Transcript is zstd compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown transcript codec: {codec}")
+
+
+def store_transcript_blob(db, text, segments=None):
+    """
+    Compress a transcript and its segments into the blob store, unless the same
+    content is already there. Nothing is committed, so the caller can write the
+    reference in the same transaction.
+
+    Args:
+        db: Database session
+        text (str): Transcript text
+        segments (list, optional): Whisper segments; only id, start, end and text are kept
+
+    Returns:
+        str: Reference to store on the Summary row
+    """
+    payload = json.dumps(
+        {
+            "text": text,
+            "segments": [
+                {key: segment[key] for key in ("id", "start", "end", "text") if key in segment}
+                for segment in segments or []
+            ],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    ref = hashlib.sha256(payload).hexdigest()
+    if db.get(TranscriptBlob, ref) is not None:
+        return ref
+
+    codec, data = _compress(payload)
+    try:
+        with db.begin_nested():
+            db.add(TranscriptBlob(hash=ref, codec=codec, size=len(payload), data=data))
+    except IntegrityError:
+        # Stored concurrently by another worker
+        pass
+    return ref
+
+
+def _decode(blob):
+    return json.loads(_decompress(blob.codec, blob.data))
+
+
+def load_transcript(db, ref):
+    """
+    Returns:
+        dict: {"text", "segments"}, or None if ref is None or missing
+    """
+    if ref is None:
+        return None
+    blob = db.get(TranscriptBlob, ref)
+    return _decode(blob) if blob is not None else None
+
+
+def load_transcript_texts(db, refs):
+    """
+    Fetch the text of several transcripts in one query.
+
+    Args:
+        db: Database session
+        refs (iterable): Transcript references, None entries are ignored
+
+    Returns:
+        dict: Text by reference
+    """
+    refs = {ref for ref in refs if ref}
+    if not refs:
+        return {}
+    blobs = db.query(TranscriptBlob).filter(TranscriptBlob.hash.in_(refs)).all()
+    return {blob.hash: _decode(blob)["text"] for blob in blobs}
@@ -0,0 +1,207 @@
+import bisect
+import os
+
+import numpy as np
+
+from .audio_io import SAMPLE_RATE
+from .chunking import frame_energy
+
+
+class SpeechMap:
+    """
+    Maps times in speech-only audio back to times in the original recording
+    """
+
+    def __init__(self, regions, total_samples, sample_rate=SAMPLE_RATE):
+        """
+        Args:
+            regions (list): (start, end) sample offsets of the kept regions in the original audio
+            total_samples (int): Length of the original audio in samples
+            sample_rate (int): Sample rate of the audio
+        """
+        self.regions = regions
+        self.total_samples = total_samples
+        self.sample_rate = sample_rate
+        self._compact_starts = []
+        position = 0
+        for start, end in regions:
+            self._compact_starts.append(position)
+            position += end - start
+        self.speech_samples = position
+
+    @property
+    def total_seconds(self):
+        return self.total_samples / self.sample_rate
+
+    @property
+    def speech_seconds(self):
+        return self.speech_samples / self.sample_rate
+
+    @property
+    def skipped_seconds(self):
+        return self.total_seconds - self.speech_seconds
+
+    def to_original(self, seconds):
+        """
+        Convert a time in the speech-only audio to a time in the original recording.
+
+        Args:
+            seconds (float): Time in the speech-only audio
+
+        Returns:
+            float: Corresponding time in the original audio
+        """
+        if not self.regions:
+            return seconds
+        sample = seconds * self.sample_rate
+        index = max(0, bisect.bisect_right(self._compact_starts, sample) - 1)
+        start, end = self.regions[index]
+        original = start + (sample - self._compact_starts[index])
+        return float(min(original, end)) / self.sample_rate
+
+    def stats(self):
+        """
+        Returns:
+            dict: Total, speech and skipped durations in seconds
+        """
+        return {
+            "total_seconds": round(self.total_seconds, 2),
+            "speech_seconds": round(self.speech_seconds, 2),
+            "skipped_seconds": round(self.skipped_seconds, 2),
+        }
+
+
+def detect_speech(
+    audio,
+    sample_rate=SAMPLE_RATE,
+    margin_db=12.0,
+    min_silence_seconds=1.0,
+    padding_seconds=0.25,
+):
+    """
+    Find speech regions with an energy detector that adapts to the noise floor
+    of the recording. Only pauses longer than min_silence_seconds are treated as
+    silence, so the short gaps between words and sentences are kept.
+
+    Args:
+        audio (numpy.ndarray): Mono float32 samples
+        sample_rate (int): Sample rate of the audio
+        margin_db (float): How far above the noise floor a frame must be to count as speech
+        min_silence_seconds (float): Shortest pause that gets removed
+        padding_seconds (float): Audio kept on each side of a speech region
+
+    Returns:
+        list: (start, end) sample offsets of the speech regions
+    """
+    energy, frame_length = frame_energy(audio, sample_rate)
+    if len(energy) == 0:
+        return []
+
+    energy_db = 20 * np.log10(np.maximum(energy, 1e-10))
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(noise_floor + margin_db, -60.0)
+    voiced = energy_db > threshold
+    if not voiced.any():
+        return []
+
+    # Rising and falling edges of the voiced mask, as frame indices
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    frame_regions = list(zip(edges[::2], edges[1::2]))
+
+    min_gap = int(min_silence_seconds * sample_rate / frame_length)
+    padding = int(padding_seconds * sample_rate)
+
+    regions = []
+    for start, end in frame_regions:
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    padded = []
+    for start, end in regions:
+        start = max(0, int(start) * frame_length - padding)
+        end = min(len(audio), int(end) * frame_length + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def noise_floor_db(audio, sample_rate=SAMPLE_RATE):
+    """
+    Returns:
+        float: Level of the quietest frames of the audio in dBFS, the background
+            the speech detector measures against
+    """
+    energy, _ = frame_energy(audio, sample_rate)
+    if len(energy) == 0:
+        return -200.0
+    return float(np.percentile(20 * np.log10(np.maximum(energy, 1e-10)), 10))
+
+
+def remove_silence(audio, sample_rate=SAMPLE_RATE, min_speech_fraction=None, silence_db=None):
+    """
+    Drop the non-speech regions of a recording. The detector is relative to the
+    recording's own noise floor, so audio of steady energy, such as constant
+    background noise or talk without pauses, can come out with little or no
+    speech; below min_speech_fraction the whole recording is kept instead, so
+    VAD never turns a real recording into an empty transcript. The fallback only
+    applies over a loud background: when the background is below silence_db the
+    detector is trusted, so silent audio, such as a dead-air window of a
+    streamed recording, is dropped.
+
+    Args:
+        audio (numpy.ndarray): Mono float32 samples
+        sample_rate (int): Sample rate of the audio
+        min_speech_fraction (float, optional): Share of the audio that must be
+            detected as speech for VAD to be trusted. Defaults to VAD_MIN_SPEECH_FRACTION.
+        silence_db (float, optional): Background level in dBFS below which the audio
+            is treated as silence rather than steady noise. Defaults to VAD_SILENCE_DB.
+
+    Returns:
+        tuple: (speech-only numpy.ndarray, SpeechMap back to the original timeline)
+    """
+    if min_speech_fraction is None:
+        min_speech_fraction = float(os.getenv("VAD_MIN_SPEECH_FRACTION", "0.05"))
+    if silence_db is None:
+        silence_db = float(os.getenv("VAD_SILENCE_DB", "-50"))
+    regions = detect_speech(audio, sample_rate)
+    speech_samples = sum(end - start for start, end in regions)
+    if len(audio) > 0 and speech_samples < min_speech_fraction * len(audio):
+        floor = noise_floor_db(audio, sample_rate)
+        if floor >= silence_db:
+            print(
+                f"VAD found speech in {speech_samples / len(audio):.0%} of the audio "
+                f"over a {floor:.0f} dBFS background, keeping all of it"
+            )
+            regions = [(0, len(audio))]
+    speech_map = SpeechMap(regions, len(audio), sample_rate)
+    if not regions:
+        return np.zeros(0, dtype=np.float32), speech_map
+
+    speech = np.concatenate([audio[start:end] for start, end in regions])
+    return speech, speech_map
+
+
+def remap_result(result, speech_map):
+    """
+    Shift the timestamps of a Whisper result computed on speech-only audio back
+    onto the original recording.
+
+    Args:
+        result (dict): Whisper-style result with segments
+        speech_map (SpeechMap): Map returned by remove_silence
+
+    Returns:
+        dict: The result, with segment and word times in the original timeline
+    """
+    for segment in result["segments"]:
+        segment["start"] = speech_map.to_original(segment["start"])
+        segment["end"] = speech_map.to_original(segment["end"])
+        for word in segment.get("words") or []:
+            word["start"] = speech_map.to_original(word["start"])
+            word["end"] = speech_map.to_original(word["end"])
+    result["vad"] = speech_map.stats()
+    return result
@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .cpu_budget import affinity_enabled, apply_budget, get_worker_plan, worker_cores
+from .job_queue import run_next_job
+
+
+def _init_worker(ready, slots, threads, pin):
+    """
+    Apply the worker's share of the CPU, then load and warm up the Whisper
+    models once per worker process, before it picks up any job, and count the
+    worker as ready.
+    """
+    from .model_registry import registry
+
+    with slots.get_lock():
+        slot = slots.value
+        slots.value += 1
+    print(f"Worker {os.getpid()} starting in slot {slot}")
+    apply_budget(threads, worker_cores(slot, threads) if pin else None)
+    registry.cpu_threads = threads
+    registry.preload()
+    with ready.get_lock():
+        ready.value += 1
+
+
+class TranscriptionPool:
+    """
+    Bounded process pool that runs transcription jobs outside the web process.
+    Each worker process keeps its own loaded Whisper model for its whole lifetime.
+    Jobs are not handed to the pool directly: workers claim them from the durable
+    queue on the summaries table, so several replicas can share the same queue.
+    The cores are split between the workers, see cpu_budget.get_worker_plan.
+    """
+
+    def __init__(self, max_workers=None, threads=None, pin=None):
+        """
+        Initialize the pool. Workers are started lazily by start().
+
+        Args:
+            max_workers (int, optional): Jobs run concurrently. Defaults to TRANSCRIBE_WORKERS.
+            threads (int, optional): Intra-op threads per worker. Defaults to
+                TRANSCRIBE_THREADS, or an equal share of the cores.
+            pin (bool, optional): Pin each worker to its own cores. Defaults to CPU_AFFINITY.
+        """
+        max_workers, planned_threads = get_worker_plan(max_workers)
+        if pin is None:
+            pin = affinity_enabled()
+
+        self.max_workers = max(1, max_workers)
+        self.threads = threads or planned_threads or 1
+        self.pin = pin
+        self._executor = None
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._ready = None
+
+    def start(self):
+        """
+        Start the worker processes.
+        """
+        context = multiprocessing.get_context("spawn")
+        self._ready = context.Value("i", 0)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._ready, context.Value("i", 0), self.threads, self.pin),
+        )
+        self._accepting = True
+        print(
+            f"Transcription pool started with {self.max_workers} workers, "
+            f"{self.threads} threads each{', pinned' if self.pin else ''}"
+        )
+
+    @property
+    def ready_workers(self):
+        """
+        int: Number of worker processes that have loaded and warmed up their models.
+        """
+        if self._ready is None:
+            return 0
+        return self._ready.value
+
+    @property
+    def outstanding(self):
+        """
+        int: Number of claim attempts currently running in the pool.
+        """
+        with self._lock:
+            return len(self._futures)
+
+    def kick(self):
+        """
+        Wake idle workers so they claim queued jobs. Never queues more claim
+        attempts than there are workers.
+        """
+        submitted = []
+        with self._lock:
+            if not self._accepting or self._executor is None:
+                return
+            while len(self._futures) < self.max_workers:
+                future = self._executor.submit(run_next_job)
+                self._futures.add(future)
+                submitted.append(future)
+        # A future that is already done runs its callback right here, and
+        # _on_done takes the lock
+        for future in submitted:
+            future.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Transcription worker error: {error}")
+        elif future.result() is not None:
+            # The worker found a job, there may be more waiting
+            self.kick()
+
+    def shutdown(self, timeout=None):
+        """
+        Stop claiming new jobs and let the running ones finish. Jobs still pending
+        stay in the queue for another worker or the next start.
+
+        Args:
+            timeout (float, optional): Seconds to wait for running jobs.
+                Defaults to TRANSCRIBE_DRAIN_TIMEOUT.
+        """
+        if self._executor is None:
+            return
+        if timeout is None:
+            timeout = float(os.getenv("TRANSCRIBE_DRAIN_TIMEOUT", "300"))
+
+        self._accepting = False
+        with self._lock:
+            futures = set(self._futures)
+
+        print(f"Draining transcription pool ({len(futures)} jobs running)...")
+        _, not_done = wait(futures, timeout=timeout)
+        if not_done:
+            print(
+                f"Drain timed out with {len(not_done)} jobs running, "
+                "their leases will expire and be reclaimed"
+            )
+
+        self._executor.shutdown(wait=not not_done, cancel_futures=True)
+        self._executor = None
+        print("Transcription pool stopped")
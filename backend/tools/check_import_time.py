@@ -0,0 +1,111 @@
+"""
+Check that the API entry point imports fast and without the ML stack.
+
+    python tools/check_import_time.py
+    python tools/check_import_time.py --budget-ms 500 --runs 5
+
+Imports the module (main by default) in a fresh interpreter with
+-X importtime, several times, and fails if the fastest run is over budget
+or if any forbidden package (whisper, torch, anthropic, numpy, ...) was
+loaded. Prints the slowest top-level imports to show where the time goes.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Packages only transcription and summarization workers may load
+FORBIDDEN = (
+    "whisper",
+    "torch",
+    "faster_whisper",
+    "ctranslate2",
+    "numpy",
+    "scipy",
+    "numba",
+    "tiktoken",
+    "transformers",
+    "anthropic",
+    "slack_sdk",
+)
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        tuple: (cumulative microseconds per imported module, names of the loaded modules)
+    """
+    code = f"import {module}; import json, sys; print(json.dumps(sorted(sys.modules)))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            # Only top-level modules, nested ones are part of their parent's time
+            if not name.startswith("  "):
+                timings[name.strip()] = int(cumulative)
+    return timings, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("API_IMPORT_BUDGET_MS", "800")),
+        help="Largest allowed import time of the module (default API_IMPORT_BUDGET_MS or 800)",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Imports to take the fastest of")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to print")
+    args = parser.parse_args()
+
+    try:
+        runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    except RuntimeError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+    timings, modules = min(runs, key=lambda run: sum(run[0].values()))
+    total_ms = sum(timings.values()) / 1000
+
+    print(f"import {args.module}: {total_ms:.0f} ms (fastest of {len(runs)})")
+    for name, cumulative in sorted(timings.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    loaded = sorted(
+        {name.split(".")[0] for name in modules} & set(FORBIDDEN)
+    )
+    if loaded:
+        print(f"FAIL: {args.module} loads {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare transcription engines on sample recordings: parity and speed.
+
+    python tools/compare_engines.py standup.wav retro.m4a --model base
+    python tools/compare_engines.py standup.wav --engines whisper ctranslate2 --max-wer 0.1
+
+Each file is decoded once and transcribed by every engine, after a warm-up.
+The first engine is the reference: the word error rate of every other engine
+is measured against its transcript. The script exits with status 1 if any
+WER exceeds --max-wer, so it can gate switching TRANSCRIBE_ENGINE.
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.audio_io import SAMPLE_RATE, decode_audio
+from services.engines import ENGINES, load_engine
+from services.model_registry import _warmup_clip
+
+
+def normalize_words(text):
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word-level Levenshtein distance divided by the reference length.
+
+    Args:
+        reference (str): Reference transcript
+        hypothesis (str): Transcript to score
+
+    Returns:
+        float: WER, 0.0 for identical word sequences
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--model", default="base", help="Whisper model (default base)")
+    parser.add_argument(
+        "--engines", nargs="+", default=list(ENGINES), choices=ENGINES,
+        help="Engines to compare, the first is the reference",
+    )
+    parser.add_argument("--threads", type=int, default=None, help="CPU threads per engine")
+    parser.add_argument("--max-wer", type=float, default=0.1)
+    args = parser.parse_args()
+
+    audios = [(path, decode_audio(path)) for path in args.paths]
+    total_seconds = sum(len(audio) for _, audio in audios) / SAMPLE_RATE
+
+    results = {}
+    timings = {}
+    for engine_name in args.engines:
+        started = time.monotonic()
+        engine = load_engine(engine_name, args.model, args.threads)
+        engine.transcribe(_warmup_clip())
+        print(
+            f"{engine_name}: loaded and warmed up in {time.monotonic() - started:.1f}s, "
+            f"{engine.memory_bytes() / 1024 / 1024:.0f} MB"
+        )
+
+        timings[engine_name] = 0.0
+        for path, audio in audios:
+            started = time.monotonic()
+            results[engine_name, path] = engine.transcribe(audio)
+            elapsed = time.monotonic() - started
+            timings[engine_name] += elapsed
+            print(
+                f"  {path}: {elapsed:.1f}s for {len(audio) / SAMPLE_RATE:.0f}s of audio, "
+                f"{len(results[engine_name, path]['segments'])} segments"
+            )
+        del engine
+
+    reference = args.engines[0]
+    failed = False
+    print(f"\n{'engine':<12} {'RTF':>7} {'speedup':>8} {'WER':>7}")
+    for engine_name in args.engines:
+        wers = [
+            word_error_rate(
+                results[reference, path]["text"], results[engine_name, path]["text"]
+            )
+            for path, _ in audios
+        ]
+        wer = max(wers)
+        failed = failed or wer > args.max_wer
+        print(
+            f"{engine_name:<12} {timings[engine_name] / total_seconds:>7.3f} "
+            f"{timings[reference] / timings[engine_name]:>7.1f}x {wer:>7.3f}"
+        )
+
+    if failed:
+        print(f"FAIL: WER above {args.max_wer} against {reference}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measure what each extra transcription worker costs in memory.
+
+    python tools/measure_shared_weights.py --model base --workers 8
+    python tools/measure_shared_weights.py --model small --workers 4 --max-delta 0.5
+
+Starts the workers together, has each load the Whisper model and transcribe a
+warm-up clip, then reads /proc/<pid>/smaps_rollup of every worker while all of
+them hold the model. Runs once with private weights (WHISPER_SHARED_WEIGHTS=false)
+and once with memory-mapped shared weights. Exits with status 1 if, with shared
+weights, a worker's own memory grows by more than --max-delta times the size of
+the model.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.shared_weights import export_whisper_weights, process_memory
+
+MB = 1024 * 1024
+
+
+def _init_measure_worker(shared):
+    os.environ["WHISPER_SHARED_WEIGHTS"] = "true" if shared else "false"
+    # Libraries are part of the baseline, only the model counts in the delta
+    import torch  # noqa: F401
+    import whisper  # noqa: F401
+
+
+def _load_and_measure(model_name, ready, workers):
+    from services.model_registry import registry
+
+    before = process_memory()
+    model = registry.get(model_name, "whisper")
+    with ready.get_lock():
+        ready.value += 1
+    # Measure once every worker maps the weights, so shared pages show as shared
+    while ready.value < workers:
+        time.sleep(0.1)
+    time.sleep(1)
+    return {
+        "model_bytes": model.memory_bytes(),
+        "before": before,
+        "all_loaded": process_memory(),
+    }
+
+
+def measure(model_name, workers, shared):
+    """
+    Returns:
+        list: Memory readings of each worker, see _load_and_measure
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Value("i", 0)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_measure_worker,
+        initargs=(shared,),
+    ) as executor:
+        # Every task waits for all the others, so each worker runs exactly one
+        futures = [
+            executor.submit(_load_and_measure, model_name, ready, workers)
+            for _ in range(workers)
+        ]
+        return [future.result() for future in futures]
+
+
+def summarize(label, readings):
+    """
+    Returns:
+        float: Mean growth of a worker's anonymous memory, as a share of the model size
+    """
+    model_bytes = readings[0]["model_bytes"]
+    deltas = [r["all_loaded"]["anonymous"] - r["before"]["anonymous"] for r in readings]
+    pss = sum(r["all_loaded"]["pss"] for r in readings)
+    mean_delta = sum(deltas) / len(deltas)
+    print(
+        f"{label:<8} per worker +{mean_delta / MB:7.0f} MB private heap "
+        f"({mean_delta / model_bytes:.2f}x model), "
+        f"{len(readings)} workers PSS {pss / MB:7.0f} MB "
+        f"({pss / model_bytes:.1f}x model)"
+    )
+    return mean_delta / model_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="base", help="Whisper model (default base)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--max-delta", type=float, default=0.5,
+        help="Largest allowed per-worker growth with shared weights, in model sizes",
+    )
+    parser.add_argument("--shared-only", action="store_true", help="Skip the private weights run")
+    args = parser.parse_args()
+
+    # Convert once up front, so the workers only map the file
+    export_whisper_weights(args.model)
+
+    if not args.shared_only:
+        summarize("private", measure(args.model, args.workers, shared=False))
+    readings = measure(args.model, args.workers, shared=True)
+    delta = summarize("shared", readings)
+    print(f"Model weights: {readings[0]['model_bytes'] / MB:.0f} MB")
+
+    if delta > args.max_delta:
+        print(f"FAIL: each worker adds more than {args.max_delta}x the model size")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Replay a recording against the live ingestion endpoint, as a meeting client would.
+
+    python tools/replay_live.py standup.wav --channel-id 1
+    python tools/replay_live.py standup.wav --channel-id 1 --speed 0   # as fast as possible
+
+The file is sent in chunks paced at real time (times --speed). WAV files are
+sent as raw 16 kHz mono PCM when they already are; anything else is streamed
+as is and decoded by ffmpeg on the server.
+"""
+import argparse
+import json
+import threading
+import time
+import wave
+from urllib.parse import urlencode
+
+from websockets.sync.client import connect
+
+
+def read_chunks(path, chunk_seconds):
+    """
+    Yield (bytes, seconds of audio) chunks of the file and the format to announce.
+
+    Returns:
+        tuple: (audio_format, generator of (bytes, seconds))
+    """
+    try:
+        with wave.open(path, "rb") as wav:
+            is_pcm16k = (
+                wav.getframerate() == 16000
+                and wav.getnchannels() == 1
+                and wav.getsampwidth() == 2
+            )
+    except (wave.Error, EOFError):
+        is_pcm16k = False
+
+    if is_pcm16k:
+        def pcm_chunks():
+            with wave.open(path, "rb") as wav:
+                frames = int(16000 * chunk_seconds)
+                while True:
+                    data = wav.readframes(frames)
+                    if not data:
+                        return
+                    yield data, len(data) / 2 / 16000
+
+        return "pcm_s16le", pcm_chunks()
+
+    def raw_chunks():
+        # Bitrate unknown: pace encoded files at 32 KB per chunk
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(32 * 1024)
+                if not data:
+                    return
+                yield data, chunk_seconds
+
+    return "auto", raw_chunks()
+
+
+def print_messages(ws, done):
+    for raw in ws:
+        message = json.loads(raw)
+        kind = message.get("type") or message.get("status")
+        if kind == "segment":
+            for segment in message["segments"]:
+                print(f"[{segment['start']:7.1f}s] {segment['text']}")
+        elif kind == "transcript":
+            print(f"--- transcript complete, {len(message['text'])} characters")
+        else:
+            print(json.dumps(message))
+    done.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="Audio file to replay")
+    parser.add_argument("--channel-id", type=int, required=True)
+    parser.add_argument("--url", default="ws://localhost:8000")
+    parser.add_argument("--chunk-seconds", type=float, default=0.5)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Playback speed, 0 sends without pausing"
+    )
+    parser.add_argument("--no-slack", action="store_true")
+    args = parser.parse_args()
+
+    audio_format, chunks = read_chunks(args.path, args.chunk_seconds)
+    query = urlencode(
+        {
+            "audio_format": audio_format,
+            "send_to_slack": "false" if args.no_slack else "true",
+            "filename": args.path.rsplit("/", 1)[-1],
+        }
+    )
+    with connect(f"{args.url}/ws/live/{args.channel_id}?{query}", close_timeout=None) as ws:
+        done = threading.Event()
+        threading.Thread(target=print_messages, args=(ws, done), daemon=True).start()
+
+        started = time.monotonic()
+        sent_seconds = 0.0
+        for data, seconds in chunks:
+            ws.send(data)
+            sent_seconds += seconds
+            if args.speed > 0:
+                delay = started + sent_seconds / args.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+        stopped = time.monotonic()
+        ws.send("stop")
+        done.wait()
+        print(f"Summary ready {time.monotonic() - stopped:.1f}s after the stream ended")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Measure how to split this host's cores between concurrent transcription jobs.
+
+    python tools/tune_cpu_budget.py standup.wav
+    python tools/tune_cpu_budget.py standup.wav --seconds 60 --rounds 3 --pin
+
+Tries each split of the cores into jobs x threads (1 x 16, 2 x 8, 4 x 4, ...),
+running the sample on every job at once, and measures the aggregate throughput
+in audio hours per hour. The best split is saved to CPU_TUNING_FILE, where
+TRANSCRIBE_WORKERS=auto picks it up for the same core count and default model.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from services.audio_io import SAMPLE_RATE, decode_audio
+from services.cpu_budget import (
+    apply_budget,
+    cpu_count,
+    get_tuning_path,
+    save_tuning,
+    worker_cores,
+)
+from services.model_registry import model_key, registry
+
+_sample = None
+
+
+def _init_tuning_worker(ready, slots, sample, threads, pin):
+    global _sample
+
+    with slots.get_lock():
+        slot = slots.value
+        slots.value += 1
+    apply_budget(threads, worker_cores(slot, threads) if pin else None)
+    registry.cpu_threads = threads
+    registry.get()
+    _sample = sample
+    with ready.get_lock():
+        ready.value += 1
+
+
+def _wait_ready(ready, workers):
+    while ready.value < workers:
+        time.sleep(0.1)
+
+
+def _transcribe_sample():
+    started = time.monotonic()
+    registry.get().transcribe(_sample)
+    return time.monotonic() - started
+
+
+def measure(sample, workers, threads, rounds, pin):
+    """
+    Run the sample rounds times on each of workers concurrent jobs.
+
+    Returns:
+        tuple: (audio seconds transcribed per wall-clock second, mean RTF of a job)
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Value("i", 0)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_tuning_worker,
+        initargs=(ready, context.Value("i", 0), sample, threads, pin),
+    ) as executor:
+        # Models load outside the measurement
+        for future in [executor.submit(_wait_ready, ready, workers) for _ in range(workers)]:
+            future.result()
+
+        started = time.monotonic()
+        futures = [executor.submit(_transcribe_sample) for _ in range(workers * rounds)]
+        job_seconds = [future.result() for future in futures]
+        elapsed = time.monotonic() - started
+
+    sample_seconds = len(sample) / SAMPLE_RATE
+    throughput = len(job_seconds) * sample_seconds / elapsed
+    return throughput, sum(job_seconds) / len(job_seconds) / sample_seconds
+
+
+def candidate_splits(cores, max_workers=None):
+    """
+    Returns:
+        list: (workers, threads) pairs using all the cores, workers doubling from 1
+    """
+    splits = []
+    workers = 1
+    while workers <= min(cores, max_workers or cores):
+        splits.append((workers, cores // workers))
+        workers *= 2
+    return splits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="Representative recording")
+    parser.add_argument("--seconds", type=float, default=120, help="Length of the sample to use")
+    parser.add_argument("--rounds", type=int, default=2, help="Samples per job and split")
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--pin", action="store_true", help="Pin each job to its own cores")
+    parser.add_argument("--dry-run", action="store_true", help="Do not save the result")
+    args = parser.parse_args()
+
+    sample = decode_audio(args.path)[: int(args.seconds * SAMPLE_RATE)]
+    cores = cpu_count()
+    print(f"Tuning {model_key()} on {cores} cores with {len(sample) / SAMPLE_RATE:.0f}s samples")
+
+    results = []
+    print(f"{'jobs':>5} {'threads':>8} {'job RTF':>8} {'audio h/h':>10}")
+    for workers, threads in candidate_splits(cores, args.max_workers):
+        throughput, rtf = measure(sample, workers, threads, args.rounds, args.pin)
+        results.append((throughput, workers, threads, rtf))
+        print(f"{workers:>5} {threads:>8} {rtf:>8.3f} {throughput:>10.1f}")
+
+    throughput, workers, threads, rtf = max(results)
+    baseline = next(result[0] for result in results if result[1] == 1)
+    print(
+        f"Best: {workers} jobs x {threads} threads, {throughput:.1f} audio hours per hour, "
+        f"{throughput / baseline:.2f}x one job at a time"
+    )
+    if args.dry_run:
+        return
+    save_tuning(
+        {
+            "cores": cores,
+            "model": model_key(),
+            "workers": workers,
+            "threads": threads,
+            "pinned": args.pin,
+            "job_rtf": round(rtf, 4),
+            "throughput": round(throughput, 2),
+            "measured_at": datetime.now(timezone.utc).isoformat(),
+        }
+    )
+    print(f"Saved to {get_tuning_path()}, used with TRANSCRIBE_WORKERS=auto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import signal
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+from services.cpu_budget import apply_budget, get_worker_plan
+from services.job_queue import JobQueueWaiter, get_worker_id, run_next_job
+
+
+def main():
+    """
+    Standalone transcription worker. Claims jobs from the durable queue on the
+    summaries table until it receives SIGTERM or SIGINT. Run as many of these as
+    needed, on any host that shares the database and TEMP_DIRECTORY. While idle
+    it waits for a new job notification, checking anyway every JOB_POLL_INTERVAL
+    seconds for expired leases. It runs one job at a time, on TRANSCRIBE_THREADS
+    threads or every core it may use: give replicas sharing a host their own
+    cpuset, or set TRANSCRIBE_THREADS to split the cores between them.
+    """
+    from services.model_registry import registry
+
+    _, threads = get_worker_plan(workers=1)
+    apply_budget(threads)
+    registry.cpu_threads = threads
+
+    worker_id = get_worker_id()
+    poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "10"))
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        print(f"Worker {worker_id} finishing current job before exit")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    registry.preload()
+    waiter = JobQueueWaiter()
+    print(f"Worker {worker_id} ready")
+
+    while not stopping:
+        if run_next_job(worker_id) is None:
+            waiter.wait(poll_interval)
+    waiter.close()
+
+    print(f"Worker {worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,7 @@ export default {
     return api.get(`/projects/${projectId}/channels`);
   },
   getChannel(channelId) {
-    return api.get(`/channels/${channelId}`)
+    return api.get(`/channels/${channelId}?fields=summary`)
   },
   createChannel(channelData) {
     return api.post('/channels', channelData)
@@ -38,6 +38,11 @@ export default {
   },
   
   // Summaries
+  getChannelSummaries(channelId, cursor) {
+    return api.get(`/summaries/channel/${channelId}`, {
+      params: { cursor, fields: 'summary' }
+    });
+  },
   createSummary(summaryData) {
     return api.post('/summaries', summaryData);
   },